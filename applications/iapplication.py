@@ -46,16 +46,17 @@ class IApplication:
         _application_dir = f"applications/{self.name}"
         _application_icon = f"{_application_dir}/assets/icon.png"
         
-        with dpg.texture_registry(show=False):
-            width, height, channels, data = dpg.load_image(_application_icon)
-            self._base._meta_data["images"].append({
-                "tag": f"{self.name}_application_icon",
-                "width": width,
-                "height": height,
-                "channels": channels,
-                "data": data,
-            })
-            dpg.add_static_texture(width, height, data, tag=f"{self.name}_application_icon")
+        # Decoded once, then memory-mapped from the texture cache on the next starts
+        width, height, channels, data = self._base._texture_cache.load(_application_icon)
+        self._base._meta_data["images"].append({
+            "tag": f"{self.name}_application_icon",
+            "width": width,
+            "height": height,
+            "channels": channels,
+            "data": data,
+        })
+        # Drawn at 80x80 on the desktop: packed into the shared icon atlas instead of a texture of its own
+        self._base._icon_atlas.add(self.name, width, height, channels, data)
     
     def update(self):
         raise NotImplementedError
@@ -73,7 +74,10 @@ class IApplication:
         raise NotImplementedError
 
     def delete(self):
-        dpg.delete_item(f"{self.name}_application_icon")
+        # Drop our decoded icon from the shared image list, or every hot reload leaks one more copy
+        _tag = f"{self.name}_application_icon"
+        self._base._meta_data["images"][:] = [image for image in self._base._meta_data["images"] if image["tag"] != _tag]
+        self._base._icon_atlas.remove(self.name)
         dpg.delete_item(f"{self.name}_application_window")
 
     def __str__(self) -> str:
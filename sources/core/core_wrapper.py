@@ -1,9 +1,19 @@
 from sources.core.utils.athena_display_utils import *
 from sources.core.utils.athena_low_level import *
 from sources.core.render.render_animation import *
+from sources.core.render.athena_frame_pacer import *
+from sources.core.render.athena_gc_manager import *
+from sources.core.render.athena_frame_timing import *
+from sources.core.render.athena_icon_atlas import *
+from sources.core.render.athena_log_viewer import *
 from sources.core.logs.athena_logs import *
+from sources.core.profiling.athena_profiling import *
+from sources.core.profiling.athena_sampling_profiler import *
+from sources.core.profiling.athena_memory_profiler import *
+from sources.core.profiling.athena_stall_watchdog import *
 from profiles.utils.athena_profiles_utils import *
 from applications.iapplication import *
 from sources.core.decorators.athena_intern_lp import *
 from sources.core.loader.inter_resources_loarder import *
+from sources.core.loader.athena_texture_cache import *
 from sources.core.utils.math.athena_math_utils import *
\ No newline at end of file
@@ -1,59 +1,103 @@
 # # Athena internal logs and profiling
 from functools import wraps
-from sources.core.utils.athena_colors import RESET, PURPLE, BLUE
+from itertools import count
+from sources.core.utils.athena_colors import RESET, PURPLE, BLUE, strip_ansi
+from sources.core.profiling.athena_profiling import TRACER
 
 import time
 
 CORE_CONFIG = {
     "internal_logging": True,
     "internal_profiling": True,
+    # Sections with logging or profiling on record a span per call whenever TRACER is started (never sampled). This key
+    # only keeps the others wrapped for tracing; read when the decorators are applied, so it has to be turned on before
+    # the modules are imported. Off, sections with logging and profiling off cost nothing.
+    "internal_tracing": False,
+    "sample": 1,  # Instrument one call in N (1 == every call)
+    # Per-section overrides of the keys above, e.g. {"Athena O'Clock": {"internal_logging": False, "sample": 60}}
+    "sections": {},
 }
 
+
+def _section_config(section):
+    overrides = CORE_CONFIG.get("sections", {}).get(section, {})
+    return (
+        overrides.get("internal_logging", CORE_CONFIG.get("internal_logging", True)),
+        overrides.get("internal_profiling", CORE_CONFIG.get("internal_profiling", True)),
+        overrides.get("internal_tracing", CORE_CONFIG.get("internal_tracing", False)),
+        max(1, int(overrides.get("sample", CORE_CONFIG.get("sample", 1)))),
+    )
+
+
 def internal_log_profiling(section, specific_log : str = None):
+    """Log start/errors and time every call of the decorated method to the athena process and console loggers,
+    or to *specific_log* only. Structured loggers (binary sinks) get section, function and duration as fields.
+    While TRACER is started, every call is also recorded as a span named "<section>.<function>" (checked per call).
+
+    CORE_CONFIG is read once, when the decorator is applied: a section with logging, profiling and tracing disabled
+    gets the undecorated function back, and the messages of an enabled one are built here rather than on every call.
+    """
+    internal_logging, internal_profiling, internal_tracing, sample = _section_config(section)
+
     def decorator(func):
+        if not internal_logging and not internal_profiling and not internal_tracing:
+            return func
+
+        func_name_colored = f"{PURPLE}{func.__name__}{RESET}"
+        clickable_location = f"{func.__code__.co_filename}:{func.__code__.co_firstlineno + 1}"
+        start_message = f"Starting {func_name_colored} in section {section} at {clickable_location}"
+        error_prefix, error_suffix = f"Error in {func_name_colored} in section {section}: ", f" at {clickable_location}"
+        timing_prefix, timing_suffix = f"{func_name_colored} in section {section} took ", f" seconds at {clickable_location}"
+        # Structured loggers store section/function/duration as fields, the message only keeps the location.
+        fields = {"section": strip_ansi(section), "function": func.__name__}
+        plain_start_message = f"Starting at {clickable_location}"
+        plain_timing_message = f"Finished at {clickable_location}"
+        span_name = f"{fields['section']}.{func.__name__}"
+        calls = count()
+
         @wraps(func)
         def wrapper(self, *args, **kwargs):
             # Access to self._base here, because self is available
             base = self._base
-            
-            func_name_colored = f"{PURPLE}{func.__name__}{RESET}"
-            file_name = func.__code__.co_filename
-            line_number = func.__code__.co_firstlineno + 1
-            clickable_location = f"{file_name}:{line_number}"
-            
-            if base and base._logs:
-                if CORE_CONFIG.get("internal_logging", True) and specific_log is None:
-                    base._logs.ap.info(f"Starting {func_name_colored} in section {section} at {clickable_location}")
-                    base._logs.ac.info(f"Starting {func_name_colored} in section {section} at {clickable_location}")
-                    base._logs.flush_all()
-                elif CORE_CONFIG.get("internal_logging", True) and specific_log is not None:
-                    base._logs[specific_log].info(f"Starting {func_name_colored} in section {section} at {clickable_location}")
-                    base._logs.flush_all()
-                
-                if CORE_CONFIG.get("internal_profiling", True):
-                    start_time = time.time()
+            if not (base and base._logs) or (sample > 1 and next(calls) % sample) or not (internal_logging or internal_profiling):
+                if TRACER.enabled:
+                    with TRACER.span(span_name, "section"):
+                        return func(self, *args, **kwargs)
+                return func(self, *args, **kwargs)
+
+            loggers = (base._logs.ap, base._logs.ac) if specific_log is None else (base._logs[specific_log],)
+            if internal_logging:
+                for logger in loggers:
+                    if getattr(logger, "structured", False):
+                        logger.record("info", plain_start_message, **fields)
+                    else:
+                        logger.info(start_message)
+                base._logs.flush_all()
+
+            start_time = time.perf_counter_ns()
             try:
-                result = func(self, *args, **kwargs)
+                return func(self, *args, **kwargs)
             except Exception as e:
-                if base and CORE_CONFIG.get("internal_logging", True) and specific_log is None:
-                    base._logs.ap.error(f"Error in {func_name_colored}: {e} at {clickable_location}")
-                    base._logs.ac.error(f"Error in {func_name_colored}: {e} at {clickable_location}")
-                    base._logs.flush_all()
-                elif base and CORE_CONFIG.get("internal_logging", True) and specific_log is not None:
-                    base._logs[specific_log].error(f"Error in {func_name_colored}: {e} at {clickable_location}")
+                if internal_logging:
+                    for logger in loggers:
+                        if getattr(logger, "structured", False):
+                            logger.record("error", f"Error: {e}{error_suffix}", **fields)
+                        else:
+                            logger.error(f"{error_prefix}{e}{error_suffix}")
                     base._logs.flush_all()
                 raise
             finally:
-                if base and CORE_CONFIG.get("internal_profiling", True) and specific_log is None:
-                    elapsed_time = time.time() - start_time
-                    base._logs.ac.info(f"{func_name_colored} in section {section} took {elapsed_time:.4f} seconds at {clickable_location}")
-                    base._logs.ap.info(f"{func_name_colored} in section {section} took {elapsed_time:.4f} seconds at {clickable_location}")
+                end_time = time.perf_counter_ns()
+                if TRACER.enabled:
+                    TRACER.complete(span_name, "section", start_time, end_time)
+                if internal_profiling:
+                    elapsed_time = (end_time - start_time) / 1e9
+                    for logger in loggers:
+                        if getattr(logger, "structured", False):
+                            logger.record("info", plain_timing_message, duration=elapsed_time, **fields)
+                        else:
+                            logger.info(f"{timing_prefix}{elapsed_time:.4f}{timing_suffix}")
                     base._logs.flush_all()
-                elif base and CORE_CONFIG.get("internal_profiling", True) and specific_log is not None:
-                    elapsed_time = time.time() - start_time
-                    base._logs[specific_log].info(f"{func_name_colored} in section {section} took {elapsed_time:.4f} seconds at {clickable_location}")
-                    base._logs.flush_all
-            return result
         return wrapper
     return decorator
 
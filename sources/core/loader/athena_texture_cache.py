@@ -0,0 +1,131 @@
+# # Athena texture cache – decoded images kept on disk as float32 .npy files, memory-mapped on load
+import hashlib
+import os
+import threading
+
+import msgpack
+import numpy as np
+from PIL import Image
+
+
+def decode_image(path: str):
+    """(width, height, 4, flat float32 RGBA in [0, 1]) of the image at *path*: the ``dpg.load_image`` layout.
+
+    Pillow and numpy release the GIL while they decode and convert, so decodes on a thread pool overlap, which
+    ``dpg.load_image`` does not allow. Raises ValueError when the file cannot be decoded."""
+    try:
+        with Image.open(path) as image:
+            pixels = np.asarray(image.convert("RGBA"), dtype=np.float32)
+    except (OSError, SyntaxError) as e:  # Pillow reports some corrupt files as SyntaxError
+        raise ValueError(f"Unable to decode texture {path}: {e}") from e
+    np.multiply(pixels, 1.0 / 255.0, out=pixels)
+    height, width, channels = pixels.shape
+    return width, height, channels, pixels.reshape(-1)
+
+
+class AthenaTextureCache:
+    """On‑disk cache of decoded textures, keyed by the hash of the source file's content.
+
+    Each entry is a float32 ``(height, width, channels)`` array saved as ``<cache_dir>/<hash>.npy`` and memory-mapped
+    read‑only on load, so a warm start costs one hash of the source file and an mmap instead of a PNG decode. A source
+    file that changes gets a new hash, hence a new entry; the index (source path -> hash) lets the stale entry be removed
+    at that point rather than piling up.
+
+    The resource loader looks textures up, decodes and writes the missing entries from its decode pool: :meth:`key`,
+    :meth:`get` and :meth:`write` run on any thread, or in a worker process (the cache pickles without its index).
+    The index is only updated by the owning process, through :meth:`record`, once per batch.
+    """
+
+    def __init__(self, cache_dir: str = "assets/.cache/textures"):
+        self._cache_dir = cache_dir
+        self._index_path = os.path.join(cache_dir, "index.msgpack")
+        self._lock = threading.Lock()
+        self._index = {}  # Absolute source path -> content hash of its cached entry
+        os.makedirs(cache_dir, exist_ok=True)
+        try:
+            with open(self._index_path, "rb") as fd:
+                self._index = msgpack.unpackb(fd.read())
+        except (OSError, ValueError, msgpack.UnpackException):
+            self._index = {}
+
+    def __getstate__(self):
+        return {"_cache_dir": self._cache_dir, "_index_path": self._index_path}
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
+        self._index = {}  # Worker side: entries only, the index belongs to the process that created the cache
+
+    def _entry(self, key: str) -> str:
+        return os.path.join(self._cache_dir, key + ".npy")
+
+    def key(self, path: str) -> str:
+        """Content hash of *path*."""
+        digest = hashlib.blake2b(digest_size=16)
+        with open(path, "rb") as fd:
+            for chunk in iter(lambda: fd.read(1 << 20), b""):
+                digest.update(chunk)
+        return digest.hexdigest()
+
+    def get(self, key: str):
+        """(width, height, channels, flat float32 memmap) for *key*, or None on a miss."""
+        try:
+            array = np.load(self._entry(key), mmap_mode="r")
+        except (OSError, ValueError):
+            return None  # Missing, or a partial file left by a crash – decoded and written again
+        height, width, channels = array.shape
+        return width, height, channels, array.reshape(-1)
+
+    def write(self, key: str, width: int, height: int, channels: int, data):
+        """Store a decoded texture under *key* and return it as :meth:`get` would. Safe from any thread or process."""
+        array = np.asarray(data, dtype=np.float32).reshape(height, width, channels)
+        entry = self._entry(key)
+        tmp = f"{entry}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp, "wb") as fd:
+            np.save(fd, array)
+        os.replace(tmp, entry)
+        return self.get(key)
+
+    def record(self, keys: dict):
+        """Point each source path of *keys* (path -> key) at its entry, removing the entries they no longer use."""
+        stale = set()
+        with self._lock:
+            changed = False
+            for path, key in keys.items():
+                source = os.path.abspath(path)
+                previous = self._index.get(source)
+                if previous == key:
+                    continue
+                self._index[source] = key
+                changed = True
+                if previous is not None:
+                    stale.add(previous)
+            if not changed:
+                return  # Warm start: nothing to write
+            stale -= set(self._index.values())
+            self._save_index()
+        for key in stale:
+            try:
+                os.remove(self._entry(key))
+            except OSError:
+                pass
+
+    def put(self, path: str, key: str, width: int, height: int, channels: int, data):
+        """Store a decoded texture of *path* under *key* and return it as :meth:`get` would."""
+        image = self.write(key, width, height, channels, data)
+        self.record({path: key})
+        return image
+
+    def load(self, path: str):
+        """(width, height, channels, data) of the image at *path*, decoded (:func:`decode_image`) only on a cache miss."""
+        key = self.key(path)
+        image = self.get(key)
+        if image is not None:
+            return image
+        return self.put(path, key, *decode_image(path))
+
+    def _save_index(self):
+        tmp = self._index_path + ".tmp"
+        with open(tmp, "wb") as fd:
+            fd.write(msgpack.packb(self._index))
+        os.replace(tmp, self._index_path)
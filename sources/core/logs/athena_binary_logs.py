@@ -0,0 +1,170 @@
+# # Athena binary logs – length-prefixed msgpack records and a memory-mapped reader
+import datetime
+import math
+import mmap
+import os
+import struct
+import threading
+import time
+
+import msgpack
+
+from sources.core.logs.athena_rotating_logs import AthenaRotatingFile
+from sources.core.utils.athena_colors import strip_ansi
+
+LEVELS = ("trace", "debug", "info", "warn", "error", "critical")
+LEVEL_IDS = {name: index for index, name in enumerate(LEVELS)}
+LEVEL_IDS["warning"] = LEVEL_IDS["warn"]
+
+# Fixed record header: payload length, timestamp, level, duration (NaN when the record is not a timing).
+# The msgpack payload that follows is [section, function, message]. Time and level filters only read the header.
+HEADER = struct.Struct("<IdBd")
+
+
+class AthenaBinaryLogger:
+    """spdlog‑like logger writing structured records. Messages are stored without ANSI colors.
+
+    ``record()`` is the structured entry point (used by internal_log_profiling); the usual level methods write a
+    record with empty section and function. With a *retention* policy the file is an AthenaRotatingFile and
+    *rewrite* rotates the previous session's log away instead of truncating it.
+    """
+
+    structured = True
+
+    def __init__(self, name: str, path: str, rewrite: bool = False, retention: dict = None):
+        self.name = name
+        self.path = path
+        self._level = LEVEL_IDS["info"]
+        self._lock = threading.Lock()
+        if retention is not None:
+            self._file = AthenaRotatingFile(path, retention, rotate_existing=rewrite)
+        else:
+            os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+            self._file = open(path, "wb" if rewrite else "ab")
+
+    def set_level(self, level):
+        self._level = int(level)  # spdlog.LogLevel values share the LEVELS order
+
+    def set_pattern(self, pattern):
+        pass  # Formatting happens when converting back to text
+
+    def record(self, level: str, message: str, section: str = "", function: str = "", duration: float = None, timestamp: float = None):
+        level_id = LEVEL_IDS[level]
+        if level_id < self._level:
+            return
+        payload = msgpack.packb((section, function, strip_ansi(message)))
+        header = HEADER.pack(
+            len(payload),
+            timestamp if timestamp is not None else time.time(),
+            level_id,
+            math.nan if duration is None else duration,
+        )
+        with self._lock:
+            self._file.write(header + payload)
+
+    def log_at(self, level: str, msg: str, timestamp: float):
+        self.record(level, msg, timestamp=timestamp)
+
+    def trace(self, msg):
+        self.record("trace", msg)
+
+    def debug(self, msg):
+        self.record("debug", msg)
+
+    def info(self, msg):
+        self.record("info", msg)
+
+    def warn(self, msg):
+        self.record("warn", msg)
+
+    def warning(self, msg):
+        self.record("warn", msg)
+
+    def error(self, msg):
+        self.record("error", msg)
+
+    def critical(self, msg):
+        self.record("critical", msg)
+
+    def flush(self):
+        with self._lock:
+            self._file.flush()
+
+    def close(self):
+        with self._lock:
+            self._file.close()
+
+
+class AthenaBinaryLogReader:
+    """Memory‑maps a binary log and iterates its records. Records cut short by a crash at the end are ignored."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._file = open(path, "rb")
+        size = os.fstat(self._file.fileno()).st_size
+        self._mm = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ) if size else b""
+
+    def close(self):
+        if isinstance(self._mm, mmap.mmap):
+            self._mm.close()
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def headers(self, offset: int = 0):
+        """Yield (offset, length, timestamp, level, duration) without touching the payloads, from the record at
+        *offset* on."""
+        mm, size = self._mm, len(self._mm)
+        while offset + HEADER.size <= size:
+            length, timestamp, level, duration = HEADER.unpack_from(mm, offset)
+            if offset + HEADER.size + length > size:
+                return
+            yield offset, length, timestamp, level, duration
+            offset += HEADER.size + length
+
+    def records(self, start: float = None, end: float = None, min_level: str = None, section: str = None,
+                function: str = None, contains: str = None):
+        """Yield records as dicts. Time and level filters are applied on the header, before any unpacking."""
+        min_level_id = LEVEL_IDS[min_level] if min_level else 0
+        for offset, length, timestamp, level, duration in self.headers():
+            if level < min_level_id or (start is not None and timestamp < start) or (end is not None and timestamp > end):
+                continue
+            body = offset + HEADER.size
+            _section, _function, message = msgpack.unpackb(self._mm[body:body + length])
+            if (section is not None and _section != section) or (function is not None and _function != function):
+                continue
+            if contains is not None and contains not in message:
+                continue
+            yield {
+                "timestamp": timestamp,
+                "level": LEVELS[level],
+                "section": _section,
+                "function": _function,
+                "duration": None if math.isnan(duration) else duration,
+                "message": message,
+            }
+
+
+def format_record(record: dict) -> str:
+    """Text loggers' default pattern, ``[%Y-%m-%d %H:%M:%S.%e] [level] message``, plus the structured fields."""
+    stamp = datetime.datetime.fromtimestamp(record["timestamp"]).strftime("%Y-%m-%d %H:%M:%S.%f")[:-3]
+    section = f"[{record['section']}] " if record["section"] else ""
+    function = f"{record['function']}: " if record["function"] else ""
+    duration = f" ({record['duration']:.4f} seconds)" if record["duration"] is not None else ""
+    return f"[{stamp}] [{record['level']}] {section}{function}{record['message']}{duration}"
+
+
+def binary_log_to_text(path: str, output: str = None, **filters) -> int:
+    """Convert the binary log *path* to text (*output* defaults to the same name with a ``.log`` suffix).
+    *filters* are those of :meth:`AthenaBinaryLogReader.records`. Returns the number of lines written."""
+    output = output or os.path.splitext(path)[0] + ".log"
+    lines = 0
+    with AthenaBinaryLogReader(path) as reader, open(output, "w", encoding="utf-8") as fd:
+        for record in reader.records(**filters):
+            fd.write(format_record(record) + "\n")
+            lines += 1
+    return lines
@@ -0,0 +1,367 @@
+# # Athena log index – sparse timestamp index and inverted token index over the log files
+import datetime
+import glob
+import math
+import os
+import re
+import time
+
+import msgpack
+
+from sources.core.logs.athena_binary_logs import AthenaBinaryLogReader, HEADER, LEVELS, LEVEL_IDS
+from sources.core.utils.athena_colors import strip_ansi
+
+# Text loggers' default pattern: "[%Y-%m-%d %H:%M:%S.%e] [level] message"
+LINE_PATTERN = re.compile(r"^\[(\d{4}-\d\d-\d\d \d\d:\d\d:\d\d)\.(\d{3})\] \[(\w+)\] (.*)$")
+# internal_log_profiling messages: "[Starting |Error in ]<function> in section <section>( took x seconds)( at |: )..."
+FUNCTION_PATTERN = re.compile(r"^(?:Starting |Error in )?(\w+) in section ")
+SECTION_PATTERN = re.compile(r" in section (.+?)(?: took [\d.]+ seconds)?(?: at |: )")
+KEYWORD_PATTERN = re.compile(r"[a-z_][a-z0-9_]{2,}")
+TEXT_LEVELS = {"warning": "warn"}
+
+INDEX_VERSION = 1
+
+
+def _keywords(message: str) -> set:
+    return set(KEYWORD_PATTERN.findall(message.lower()))
+
+
+def _tokens(level: str, section: str, function: str, message: str) -> set:
+    tokens = _keywords(message)
+    tokens.add(f"level:{level}")
+    if section:
+        tokens.add(f"section:{section.lower()}")
+    if function:
+        tokens.add(f"function:{function.lower()}")
+    return tokens
+
+
+def _is_record_start(line: str) -> bool:
+    return line[:1] == "[" and line[24:27] == "] ["  # "[YYYY-mm-dd HH:MM:SS.mmm] [level] "
+
+
+def _timestamp(value) -> float:
+    return value.timestamp() if isinstance(value, datetime.datetime) else value
+
+
+class _FileIndex:
+    """Index of one log file, split in blocks of *block_records* records.
+
+    ``blocks`` is the sparse timestamp index: [offset, first timestamp, last timestamp] of each block. ``postings``
+    is the inverted index: token -> sorted ids of the blocks holding at least one record with that token. A query
+    only reads back the blocks left after intersecting postings and time ranges, and checks their records exactly.
+    """
+
+    def __init__(self, path: str, block_records: int):
+        self.path = path
+        self.binary = path.endswith(".alog")
+        self.block_records = block_records
+        self.size = 0  # Bytes indexed so far – updates resume from here
+        self.signature = b""  # First bytes of the file, to detect a rotated/rewritten file
+        self.blocks = []
+        self.postings = {}
+        self._block_count = 0  # Records in the last block
+        self._second = None
+        self._second_epoch = 0.0
+
+    # ----------------------------------------------------------------------------------
+    # Persistence
+    # ----------------------------------------------------------------------------------
+
+    def to_dict(self) -> dict:
+        return {
+            "version": INDEX_VERSION, "path": self.path, "block_records": self.block_records, "size": self.size,
+            "signature": self.signature, "blocks": self.blocks, "postings": self.postings, "block_count": self._block_count,
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "_FileIndex":
+        index = cls(data["path"], data["block_records"])
+        index.size, index.signature = data["size"], data["signature"]
+        index.blocks, index.postings, index._block_count = data["blocks"], data["postings"], data["block_count"]
+        return index
+
+    # ----------------------------------------------------------------------------------
+    # Indexing
+    # ----------------------------------------------------------------------------------
+
+    def update(self) -> int:
+        """Index what was appended since the last update (everything again if the file was rotated or rewritten).
+        Returns the number of new records."""
+        try:
+            size = os.path.getsize(self.path)
+            with open(self.path, "rb") as fd:
+                signature = fd.read(64)
+        except OSError:
+            return 0
+        if size < self.size or signature[:len(self.signature)] != self.signature:
+            self.size, self.blocks, self.postings, self._block_count = 0, [], {}, 0
+        self.signature = signature
+        if size == self.size:
+            return 0
+        return self._update_binary() if self.binary else self._update_text()
+
+    def _add(self, offset: int, timestamp: float, tokens: set):
+        if not self.blocks or self._block_count >= self.block_records:
+            self.blocks.append([offset, timestamp, timestamp])
+            self._block_count = 0
+        block_id = len(self.blocks) - 1
+        block = self.blocks[block_id]
+        block[1], block[2] = min(block[1], timestamp), max(block[2], timestamp)
+        self._block_count += 1
+        for token in tokens:
+            posting = self.postings.setdefault(token, [])
+            if not posting or posting[-1] != block_id:
+                posting.append(block_id)
+
+    def _update_binary(self) -> int:
+        added = 0
+        with AthenaBinaryLogReader(self.path) as reader:
+            for offset, length, timestamp, level, duration in reader.headers(self.size):
+                body = offset + HEADER.size
+                section, function, message = msgpack.unpackb(reader._mm[body:body + length])
+                self._add(offset, timestamp, _tokens(LEVELS[level], section, function, message))
+                self.size = body + length
+                added += 1
+        return added
+
+    def _epoch(self, second: str) -> float:
+        if second != self._second:  # Lines come in order: one strptime per second of log, not per line
+            self._second = second
+            self._second_epoch = time.mktime(time.strptime(second, "%Y-%m-%d %H:%M:%S"))
+        return self._second_epoch
+
+    def _parse_line(self, line: str):
+        match = LINE_PATTERN.match(line)
+        if match is None:
+            return None
+        second, millis, level, message = match.groups()
+        message = strip_ansi(message)
+        function, section = FUNCTION_PATTERN.match(message), SECTION_PATTERN.search(message)
+        return (
+            self._epoch(second) + int(millis) / 1000.0,
+            TEXT_LEVELS.get(level, level),
+            section.group(1) if section else "",
+            function.group(1) if function else "",
+            message,
+        )
+
+    def _update_text(self) -> int:
+        with open(self.path, "rb") as fd:
+            fd.seek(self.size)
+            data = fd.read()
+        data = data[:data.rfind(b"\n") + 1]  # A line still being written is indexed next time
+        added, offset = 0, self.size
+        for raw in data.splitlines(keepends=True):
+            record = self._parse_line(raw.decode("utf-8", errors="replace").rstrip("\r\n"))
+            if record is not None:
+                timestamp, level, section, function, message = record
+                self._add(offset, timestamp, _tokens(level, section, function, message))
+                added += 1
+            elif self.blocks:  # Continuation of a multi-line message: same record, same block
+                self._add_tokens_to_last_block(_keywords(strip_ansi(raw.decode("utf-8", errors="replace"))))
+            offset += len(raw)
+        self.size = offset
+        return added
+
+    def _add_tokens_to_last_block(self, tokens: set):
+        block_id = len(self.blocks) - 1
+        for token in tokens:
+            posting = self.postings.setdefault(token, [])
+            if not posting or posting[-1] != block_id:
+                posting.append(block_id)
+
+    # ----------------------------------------------------------------------------------
+    # Query
+    # ----------------------------------------------------------------------------------
+
+    def candidate_blocks(self, groups: list, start: float, end: float) -> list:
+        """Blocks holding, for every group, at least one of its tokens, and overlapping [start, end]."""
+        candidates = None
+        for group in groups:
+            matching = set()
+            for token in group:
+                matching.update(self.postings.get(token, ()))
+            candidates = matching if candidates is None else candidates & matching
+            if not candidates:
+                return []
+        ids = sorted(candidates) if candidates is not None else range(len(self.blocks))
+        return [
+            i for i in ids
+            if (start is None or self.blocks[i][2] >= start) and (end is None or self.blocks[i][1] <= end)
+        ]
+
+    def scan_block(self, block_id: int, prefilter=()):
+        """Yield (timestamp, level, section, function, duration, message) for the records of a block. Text records
+        whose first line lacks one of the lowercase *prefilter* strings are skipped before being parsed."""
+        begin = self.blocks[block_id][0]
+        stop = self.blocks[block_id + 1][0] if block_id + 1 < len(self.blocks) else self.size
+        if self.binary:
+            with AthenaBinaryLogReader(self.path) as reader:
+                for offset, length, timestamp, level, duration in reader.headers(begin):
+                    if offset >= stop:
+                        break
+                    body = offset + HEADER.size
+                    section, function, message = msgpack.unpackb(reader._mm[body:body + length])
+                    yield timestamp, LEVELS[level], section, function, None if math.isnan(duration) else duration, message
+            return
+        with open(self.path, "rb") as fd:
+            fd.seek(begin)
+            data = fd.read(stop - begin).decode("utf-8", errors="replace")
+        yield from (self._scan_text_filtered(data, prefilter) if prefilter else self._scan_text(data))
+
+    def _scan_text(self, data: str):
+        record = None
+        for raw in data.splitlines():
+            if _is_record_start(raw):
+                if record is not None:
+                    yield record[0], record[1], record[2], record[3], None, record[4]
+                parsed = self._parse_line(raw)
+                record = list(parsed) if parsed is not None else None
+            elif record is not None:
+                record[4] += "\n" + strip_ansi(raw)
+        if record is not None:
+            yield record[0], record[1], record[2], record[3], None, record[4]
+
+    def _scan_text_filtered(self, data: str, prefilter):
+        """Jump from one occurrence of the first *prefilter* string to the next (regex search, no Python loop over
+        the lines), and only parse the record lines holding all of them."""
+        finder = re.compile(re.escape(prefilter[0]), re.IGNORECASE)
+        size, position = len(data), 0
+        while True:
+            match = finder.search(data, position)
+            if match is None:
+                return
+            start = data.rfind("\n", 0, match.start()) + 1
+            end = data.find("\n", match.end())
+            end = size if end < 0 else end
+            position = end + 1
+            line = data[start:end].rstrip("\r")
+            if not _is_record_start(line):
+                continue
+            lowered = line.lower()
+            if not all(needle in lowered for needle in prefilter[1:]):
+                continue
+            parsed = self._parse_line(line)
+            if parsed is None:
+                continue
+            record = list(parsed)
+            while position < size and not _is_record_start(data[position:position + 27]):
+                end = data.find("\n", position)
+                end = size if end < 0 else end
+                record[4] += "\n" + strip_ansi(data[position:end].rstrip("\r"))
+                position = end + 1
+            yield record[0], record[1], record[2], record[3], None, record[4]
+
+
+class AthenaLogIndex:
+    """Searchable index of the log files of *log_dir* (text ``.log`` and binary ``.alog``).
+
+    Indexes are kept in *index_dir* (``<log_dir>/.index`` by default) and :meth:`update` only reads what the files
+    gained since the last call, so it can run periodically, e.g. as a threaded AthenaOClock job::
+
+        index = AthenaLogIndex("logs")
+        oclock.add_job("athena_log_index", index.update, 5000, threaded=True)
+        index.search(level="error", section="AthenaResourceLoader", start=datetime(...10, 2), end=datetime(...10, 5))
+
+    Rotated segments are not indexed once compressed (gzip has no random access).
+    """
+
+    def __init__(self, log_dir: str = "logs", index_dir: str = None, patterns=("*.log", "*.alog"), block_records: int = 256):
+        self._log_dir = log_dir
+        self._index_dir = index_dir or os.path.join(log_dir, ".index")
+        self._patterns = patterns
+        self._block_records = block_records
+        self._files = {}
+
+    @property
+    def files(self) -> list:
+        return sorted(self._files)
+
+    def _index_path(self, path: str) -> str:
+        return os.path.join(self._index_dir, os.path.basename(path) + ".idx")
+
+    def _load(self, path: str) -> _FileIndex:
+        try:
+            with open(self._index_path(path), "rb") as fd:
+                data = msgpack.unpackb(fd.read(), strict_map_key=False)
+            if data.get("version") == INDEX_VERSION and data.get("block_records") == self._block_records:
+                return _FileIndex.from_dict(data)
+        except (OSError, ValueError, KeyError, msgpack.UnpackException):
+            pass
+        return _FileIndex(path, self._block_records)
+
+    def _save(self, index: _FileIndex):
+        os.makedirs(self._index_dir, exist_ok=True)
+        target = self._index_path(index.path)
+        with open(target + ".tmp", "wb") as fd:
+            fd.write(msgpack.packb(index.to_dict()))
+        os.replace(target + ".tmp", target)
+
+    def update(self) -> int:
+        """Pick up new files and index what every file gained. Returns the number of records added."""
+        added = 0
+        for pattern in self._patterns:
+            for path in glob.glob(os.path.join(self._log_dir, pattern)):
+                index = self._files.get(path)
+                if index is None:
+                    index = self._files[path] = self._load(path)
+                new = index.update()
+                if new:
+                    self._save(index)
+                    added += new
+        for path in [path for path in self._files if not os.path.exists(path)]:
+            del self._files[path]
+        return added
+
+    def search(self, start=None, end=None, level: str = None, min_level: str = None, section: str = None,
+               function: str = None, keywords=(), files=None, limit: int = 1000) -> list:
+        """Records matching every given criterion, sorted by time. *start*/*end* are datetimes or epoch seconds,
+        *level* an exact level and *min_level* a lower bound, *keywords* words that must all appear in the message.
+        Only the blocks selected by the indexes are read back from the files."""
+        start, end = _timestamp(start), _timestamp(end)
+        groups = []
+        if level is not None:
+            groups.append([f"level:{TEXT_LEVELS.get(level, level)}"])
+        if min_level is not None:
+            groups.append([f"level:{name}" for name in LEVELS[LEVEL_IDS[min_level]:]])
+        if section is not None:
+            groups.append([f"section:{section.lower()}"])
+        if function is not None:
+            groups.append([f"function:{function.lower()}"])
+        keywords = [keyword.lower() for keyword in keywords]
+        # Words too short (or numbers) are not indexed: they are only checked on the records read back
+        tokens = {keyword for keyword in keywords if KEYWORD_PATTERN.fullmatch(keyword)}
+        substrings = [keyword for keyword in keywords if keyword not in tokens]
+        groups.extend([token] for token in tokens)
+
+        # Cheap substring checks on the raw first line of text records, before any parsing (level first: most selective)
+        prefilter = [needle.lower() for needle in (section, function) if needle]
+        if level is not None:
+            prefilter.insert(0, "] [warning] " if TEXT_LEVELS.get(level, level) == "warn" else f"] [{level}] ")
+
+        results = []
+        for path in (files or self.files):
+            index = self._files.get(path)
+            if index is None:
+                continue
+            for block_id in index.candidate_blocks(groups, start, end):
+                for timestamp, _level, _section, _function, duration, message in index.scan_block(block_id, prefilter):
+                    if (start is not None and timestamp < start) or (end is not None and timestamp > end):
+                        continue
+                    if (level is not None and _level != TEXT_LEVELS.get(level, level)) or \
+                            (min_level is not None and LEVEL_IDS[_level] < LEVEL_IDS[min_level]):
+                        continue
+                    if (section is not None and _section.lower() != section.lower()) or \
+                            (function is not None and _function.lower() != function.lower()):
+                        continue
+                    if tokens and not _keywords(message).issuperset(tokens):
+                        continue
+                    if substrings and not all(substring in message.lower() for substring in substrings):
+                        continue
+                    results.append({
+                        "file": path, "timestamp": timestamp, "level": _level, "section": _section,
+                        "function": _function, "duration": duration, "message": message,
+                    })
+        results.sort(key=lambda record: record["timestamp"])
+        return results[:limit] if limit else results
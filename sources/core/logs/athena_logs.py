@@ -1,5 +1,84 @@
+from sources.core.logs.athena_binary_logs import AthenaBinaryLogger
+from sources.core.logs.athena_ring_logs import AthenaLogRing, AthenaRingLogger
+from sources.core.logs.athena_rotating_logs import AthenaRotatingFileLogger, DEFAULT_RETENTION, LEVEL_NAMES, TimestampFormatter
+from sources.core.metrics.athena_metrics import METRICS
+
 import spdlog as spd
+import atexit
+import collections
 import os
+import threading
+import time
+
+LOG_RECORDS = METRICS.counter("athena_log_records_total", "Log records queued by the async pipeline", ("level",))
+LOG_BATCHES = METRICS.histogram("athena_log_batch_records", "Records written per writer thread batch", (), buckets=(1, 4, 16, 64, 256, 1024, 4096))
+
+
+class AthenaStampedLogger:
+    """spdlog loggers stamp a record when they write it, which in async mode is whenever the writer thread gets to it.
+    This adapter puts the time of the call in the message instead, the pattern being reduced to the (level coloured)
+    message; set_pattern is ignored."""
+
+    def __init__(self, logger):
+        self._logger = logger
+        self._stamp = TimestampFormatter()
+        logger.set_pattern("%^%v%$")
+
+    def log_at(self, level, msg, timestamp):
+        getattr(self._logger, level)(f"{self._stamp(timestamp)} [{LEVEL_NAMES[level]}] {msg}")
+
+    def set_pattern(self, pattern):
+        pass
+
+    def __getattr__(self, name):
+        return getattr(self._logger, name)
+
+
+class AthenaAsyncLogger:
+    """Stands in for an spdlog logger in async mode: records are queued with the time of the call, the AthenaLogs
+    writer thread writes them."""
+
+    def __init__(self, logs: "AthenaLogs", logger):
+        self._logs = logs
+        self._logger = logger
+
+    def trace(self, msg):
+        self._logs._enqueue(self._logger, "trace", msg, time.time())
+
+    def debug(self, msg):
+        self._logs._enqueue(self._logger, "debug", msg, time.time())
+
+    def info(self, msg):
+        self._logs._enqueue(self._logger, "info", msg, time.time())
+
+    def warn(self, msg):
+        self._logs._enqueue(self._logger, "warn", msg, time.time())
+
+    def warning(self, msg):
+        self._logs._enqueue(self._logger, "warning", msg, time.time())
+
+    def error(self, msg):
+        self._logs._enqueue(self._logger, "error", msg, time.time())
+
+    def critical(self, msg):
+        self._logs._enqueue(self._logger, "critical", msg, time.time())
+
+    @property
+    def structured(self) -> bool:
+        return getattr(self._logger, "structured", False)
+
+    def record(self, level, msg, **fields):
+        # Stamp now: the writer thread runs later
+        fields.setdefault("timestamp", time.time())
+        self._logs._enqueue(self._logger, "record", level, msg, fields)
+
+    def flush(self):
+        pass  # The writer thread flushes
+
+    def __getattr__(self, name):
+        # set_level, set_pattern... go straight to the wrapped logger
+        return getattr(self._logger, name)
+
 
 class AthenaLogs:
     logLevel = {
@@ -23,14 +102,116 @@ class AthenaLogs:
         logger.set_level(log_level)
         return logger
     
-    def __init__(self):
+    def create_binary_logger(self, name, path, log_level=spd.LogLevel.INFO, rewrite=False):
+        """Structured sink: length‑prefixed msgpack records, read back with AthenaBinaryLogReader."""
+        logger = AthenaBinaryLogger(name, path, rewrite=rewrite)
+        logger.set_level(log_level)
+        return logger
+
+    def create_rotating_logger(self, name, path, log_level=spd.LogLevel.INFO, rewrite=False, binary=False):
+        """Text (or binary) file logger rotated on the size/age caps of the *name* retention policy. Rotated
+        segments are gzipped and pruned in the background; *rewrite* rotates the previous session's file away."""
+        if binary:
+            logger = AthenaBinaryLogger(name, path, rewrite=rewrite, retention=self.retention_for(name))
+        else:
+            logger = AthenaRotatingFileLogger(name, path, self.retention_for(name), rotate_existing=rewrite)
+        logger.set_level(log_level)
+        return logger
+
+    def retention_for(self, name) -> dict:
+        """Retention policy of a logger: DEFAULT_RETENTION, then the "default" entry, then the *name* entry."""
+        return {**DEFAULT_RETENTION, **self._retention.get("default", {}), **self._retention.get(name, {})}
+
+    def __init__(self, async_mode: bool = False, batch_size: int = 256, flush_interval: float = 0.1, retention: dict = None,
+                 ring_capacity: int = 0):
+        """In *async_mode*, log calls only append to a queue; a background writer writes them in batches and
+        flushes every *flush_interval* seconds, as soon as *batch_size* records are waiting, or on error records.
+        flush_all() then becomes a no‑op and shutdown() (also registered with atexit) drains what is left.
+
+        *retention* maps logger names (or "default") to partial retention policies, see DEFAULT_RETENTION.
+        With a *ring_capacity*, the last *ring_capacity* records of every logger are also kept in memory (see rings)."""
+        self._retention = retention or {}
+        self._ring_capacity = ring_capacity
+        self._rings = {}
+        self._async_mode = async_mode
+        self._batch_size = batch_size
+        self._flush_interval = flush_interval
+        self._queue = collections.deque()  # append/popleft are atomic – producers never take a lock
+        self._wakeup = threading.Event()
+        self._writer = None
+
         self._loggers = {
-            "athena_process": self.create_file_logger("athena_process", "logs/athena_process.log", rewrite=True),
-            "athena_console": self.create_console_logger("athena_console"),
+            "athena_process": self._wrap(self.create_rotating_logger("athena_process", "logs/athena_process.log", rewrite=True), "athena_process"),
+            "athena_console": self._wrap(self.create_console_logger("athena_console"), "athena_console"),
         }
         self._abbrev_loggers = {}
         self._initialize_abbreviations()
 
+        if async_mode:
+            METRICS.gauge("athena_log_queue_depth", "Log records waiting for the writer thread").track(lambda: len(self._queue))
+            self._writer = threading.Thread(target=self._write_loop, name="athena_logs_writer", daemon=True)
+            self._writer.start()
+            atexit.register(self.shutdown)
+
+    # ----------------------------------------------------------------------------------
+    # Async pipeline
+    # ----------------------------------------------------------------------------------
+
+    def _wrap(self, logger, name=None):
+        if isinstance(logger, AthenaAsyncLogger):
+            return logger
+        if self._async_mode and not hasattr(logger, "log_at"):
+            logger = AthenaStampedLogger(logger)  # spdlog sink: cannot be given the time of the call
+        if self._ring_capacity and name is not None and not isinstance(logger, AthenaRingLogger):
+            self._rings[name] = AthenaLogRing(self._ring_capacity)
+            logger = AthenaRingLogger(logger, self._rings[name])
+        if not self._async_mode:
+            return logger
+        return AthenaAsyncLogger(self, logger)
+
+    def _enqueue(self, logger, method, *args):
+        self._queue.append((logger, method, args))
+        level = args[0] if method == "record" else method
+        LOG_RECORDS.inc(level=level)
+        if level in ("error", "critical") or len(self._queue) >= self._batch_size:
+            self._wakeup.set()
+
+    def _drain(self):
+        """Write every queued record, then flush the loggers that received one."""
+        touched = set()
+        written = 0
+        while True:
+            try:
+                logger, method, args = self._queue.popleft()
+            except IndexError:
+                break
+            written += 1
+            if method == "record":
+                level, msg, fields = args
+                logger.record(level, msg, **fields)
+            else:
+                msg, timestamp = args
+                logger.log_at(method, msg, timestamp)
+            touched.add(logger)
+        for logger in touched:
+            logger.flush()
+        if written:
+            LOG_BATCHES.observe(written)
+
+    def _write_loop(self):
+        while self._writer is not None:
+            self._wakeup.wait(self._flush_interval)
+            self._wakeup.clear()
+            self._drain()
+
+    def shutdown(self):
+        """Stop the writer thread and write/flush everything still queued. Safe to call more than once."""
+        writer, self._writer = self._writer, None
+        if writer is not None:
+            self._wakeup.set()
+            writer.join(timeout=1.0)
+        self._drain()
+
     def _initialize_abbreviations(self):
         for name in self._loggers:
             abbrev_name = ''.join([word[0] for word in name.split('_')])
@@ -50,9 +231,14 @@ class AthenaLogs:
         self._abbrev_loggers[abbrev_name] = self._loggers[name]
     
     def add_update_logger(self, name, logger):
-        self._loggers[name] = logger
+        self._loggers[name] = self._wrap(logger, name)
         self._create_dynamic_property(name)
     
+    @property
+    def rings(self) -> dict:
+        """Logger name -> AthenaLogRing (empty unless created with a ring_capacity)."""
+        return self._rings
+
     @property
     def ap(self):
         return self._loggers["athena_process"]
@@ -62,6 +248,8 @@ class AthenaLogs:
         return self._loggers["athena_console"]
     
     def flush_all(self):
+        if self._async_mode:
+            return  # The writer thread flushes on size/time thresholds and on errors
         for logger in self._loggers.values():
             logger.flush()
             
\ No newline at end of file
@@ -0,0 +1,148 @@
+# # Athena ring logs – last N records of a logger kept in memory, with per-level indexes for filtered views
+from array import array
+import threading
+import time
+
+from sources.core.logs.athena_binary_logs import LEVELS, LEVEL_IDS
+from sources.core.utils.athena_colors import strip_ansi
+
+
+class AthenaLogRing:
+    """Fixed‑size ring of (timestamp, level, message) records.
+
+    Every record gets a sequence number; slot = sequence % capacity. ``_indexes[k]`` is itself a ring holding the
+    sequence numbers of the records whose level is >= k (k > 0, level 0 is every record), so the n‑th row of a
+    filtered view is two array lookups away: a viewer never scans the buffer. Messages are stored as given and only
+    cleaned up when displayed.
+    """
+
+    def __init__(self, capacity: int = 100_000):
+        if capacity <= 0:
+            raise ValueError("The ring capacity must be positive.")
+        self.capacity = capacity
+        self._timestamps = array("d", bytes(8 * capacity))
+        self._levels = bytearray(capacity)
+        self._messages = [""] * capacity
+        self._indexes = [None] + [array("q", bytes(8 * capacity)) for _ in LEVELS[1:]]
+        self._counts = [0] * len(LEVELS)
+        self._total = 0
+        self._lock = threading.Lock()
+
+    @property
+    def total(self) -> int:
+        """Records appended since creation (changes whenever the content does)."""
+        return self._total
+
+    def append(self, level: str, message: str, timestamp: float = None):
+        level_id = LEVEL_IDS[level]
+        capacity = self.capacity
+        with self._lock:
+            seq = self._total
+            slot = seq % capacity
+            self._timestamps[slot] = timestamp if timestamp is not None else time.time()
+            self._levels[slot] = level_id
+            self._messages[slot] = message
+            for k in range(1, level_id + 1):
+                self._indexes[k][self._counts[k] % capacity] = seq
+                self._counts[k] += 1
+            self._total = seq + 1
+
+    def _first_valid(self, k: int) -> int:
+        """Logical position of the oldest entry of index *k* whose record is still in the buffer (binary search,
+        the index is sorted). Entries below it point to overwritten slots."""
+        oldest = self._total - self.capacity
+        index, count, capacity = self._indexes[k], self._counts[k], self.capacity
+        lo, hi = max(0, count - capacity), count
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if index[mid % capacity] < oldest:
+                lo = mid + 1
+            else:
+                hi = mid
+        return lo
+
+    def count(self, min_level: str = "trace") -> int:
+        k = LEVEL_IDS[min_level]
+        with self._lock:
+            if k == 0:
+                return min(self._total, self.capacity)
+            return self._counts[k] - self._first_valid(k)
+
+    def rows(self, start: int, stop: int, min_level: str = "trace") -> list:
+        """Rows [start, stop) of the view filtered on *min_level*, as (timestamp, level, message) tuples."""
+        k = LEVEL_IDS[min_level]
+        capacity = self.capacity
+        rows = []
+        with self._lock:
+            if k == 0:
+                first, size = max(0, self._total - capacity), min(self._total, capacity)
+                seqs = range(first + max(0, start), first + min(stop, size))
+            else:
+                first = self._first_valid(k)
+                index = self._indexes[k]
+                seqs = [index[j % capacity] for j in range(first + max(0, start), min(first + stop, self._counts[k]))]
+            for seq in seqs:
+                slot = seq % capacity
+                rows.append((self._timestamps[slot], LEVELS[self._levels[slot]], self._messages[slot]))
+        return rows
+
+    def clear(self):
+        with self._lock:
+            self._counts = [0] * len(LEVELS)
+            self._total = 0
+
+
+def format_row(timestamp: float, level: str, message: str) -> str:
+    return f"{time.strftime('%H:%M:%S', time.localtime(timestamp))}.{int(timestamp % 1 * 1000):03d} [{level}] {strip_ansi(message)}"
+
+
+class AthenaRingLogger:
+    """Tees a logger into an AthenaLogRing. Wrapped under the async logger, so in async mode the ring is filled by
+    the writer thread and the caller pays nothing extra."""
+
+    def __init__(self, logger, ring: AthenaLogRing):
+        self._logger = logger
+        self.ring = ring
+
+    def trace(self, msg):
+        self.ring.append("trace", msg)
+        self._logger.trace(msg)
+
+    def debug(self, msg):
+        self.ring.append("debug", msg)
+        self._logger.debug(msg)
+
+    def info(self, msg):
+        self.ring.append("info", msg)
+        self._logger.info(msg)
+
+    def warn(self, msg):
+        self.ring.append("warn", msg)
+        self._logger.warn(msg)
+
+    def warning(self, msg):
+        self.ring.append("warn", msg)
+        self._logger.warning(msg)
+
+    def error(self, msg):
+        self.ring.append("error", msg)
+        self._logger.error(msg)
+
+    def critical(self, msg):
+        self.ring.append("critical", msg)
+        self._logger.critical(msg)
+
+    def log_at(self, level, msg, timestamp):
+        self.ring.append(level, msg, timestamp)
+        self._logger.log_at(level, msg, timestamp)
+
+    @property
+    def structured(self) -> bool:
+        return getattr(self._logger, "structured", False)
+
+    def record(self, level, msg, **fields):
+        self.ring.append(level, msg, fields.get("timestamp"))
+        self._logger.record(level, msg, **fields)
+
+    def __getattr__(self, name):
+        return getattr(self._logger, name)
@@ -0,0 +1,195 @@
+# # Athena rotating logs – size/age capped log files, rotated segments compressed in the background
+import glob
+import gzip
+import os
+import queue
+import shutil
+import threading
+import time
+
+LEVEL_NAMES = {
+    "trace": "trace", "debug": "debug", "info": "info", "warn": "warning", "warning": "warning",
+    "error": "error", "critical": "critical",
+}
+LEVEL_IDS = {"trace": 0, "debug": 1, "info": 2, "warn": 3, "warning": 3, "error": 4, "critical": 5}
+
+# Retention of a logger: segment caps, how many rotated segments to keep and for how long, and gzip or not.
+DEFAULT_RETENTION = {
+    "max_bytes": 64 * 1024 * 1024,  # Rotate once the current segment reaches this size (0 == no size cap)
+    "max_age": 24 * 3600.0,  # Rotate once the current segment is this old, in seconds (0 == no age cap)
+    "backups": 5,  # Rotated segments kept (0 == keep all)
+    "max_backup_age": 7 * 24 * 3600.0,  # Rotated segments older than this are deleted (0 == keep forever)
+    "compress": True,
+}
+
+
+class _Compressor:
+    """Single background thread gzipping rotated segments and enforcing retention, so writers never wait on it."""
+
+    def __init__(self):
+        self._queue = queue.SimpleQueue()
+        self._thread = None
+        self._lock = threading.Lock()
+
+    def submit(self, segment: str, pattern: str, retention: dict):
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._loop, name="athena_logs_compressor", daemon=True)
+                self._thread.start()
+        self._queue.put((segment, pattern, retention))
+
+    def _loop(self):
+        while True:
+            segment, pattern, retention = self._queue.get()
+            try:
+                if retention["compress"] and os.path.exists(segment):
+                    with open(segment, "rb") as src, gzip.open(segment + ".gz.tmp", "wb") as dst:
+                        shutil.copyfileobj(src, dst)
+                    os.replace(segment + ".gz.tmp", segment + ".gz")  # Never leave a half written .gz behind
+                    os.remove(segment)
+                self._prune(pattern, retention)
+            except OSError:
+                pass  # Best effort – a segment we cannot compress or delete stays on disk
+
+    @staticmethod
+    def _prune(pattern: str, retention: dict):
+        segments = sorted(glob.glob(pattern), reverse=True)  # Timestamped names: newest first
+        now = time.time()
+        for index, segment in enumerate(segments):
+            too_many = retention["backups"] and index >= retention["backups"]
+            too_old = retention["max_backup_age"] and now - os.path.getmtime(segment) > retention["max_backup_age"]
+            if too_many or too_old:
+                os.remove(segment)
+
+
+_compressor = _Compressor()
+
+
+class AthenaRotatingFile:
+    """Append‑only file rotated on size and age caps.
+
+    Rotating renames the current segment to ``<name>.<timestamp><ext>`` and reopens a fresh file: both are cheap,
+    the compression and the retention pass run on the shared compressor thread. With *rotate_existing*, a file left
+    by a previous session is rotated away instead of being deleted or appended to.
+    """
+
+    def __init__(self, path: str, retention: dict = None, rotate_existing: bool = False):
+        self.path = path
+        self._retention = {**DEFAULT_RETENTION, **(retention or {})}
+        self._root, self._ext = os.path.splitext(path)
+        self._lock = threading.Lock()
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        if rotate_existing and os.path.exists(path) and os.path.getsize(path):
+            self._archive()
+        self._open()
+
+    def _open(self):
+        self._file = open(self.path, "ab")
+        self._size = self._file.tell()
+        self._opened = time.time()
+
+    def _archive(self):
+        stamp = time.strftime("%Y%m%d-%H%M%S") + f"-{time.time_ns() % 1_000_000_000:09d}"
+        segment = f"{self._root}.{stamp}{self._ext}"
+        os.replace(self.path, segment)
+        _compressor.submit(segment, f"{self._root}.*{self._ext}*", self._retention)
+
+    def rotate(self):
+        with self._lock:
+            self._rotate()
+
+    def _rotate(self):
+        self._file.close()
+        self._archive()
+        self._open()
+
+    def write(self, data: bytes):
+        with self._lock:
+            retention = self._retention
+            if (retention["max_bytes"] and self._size and self._size + len(data) > retention["max_bytes"]) or \
+                    (retention["max_age"] and time.time() - self._opened > retention["max_age"]):
+                self._rotate()
+            self._file.write(data)
+            self._size += len(data)
+
+    def flush(self):
+        with self._lock:
+            self._file.flush()
+
+    def close(self):
+        with self._lock:
+            self._file.close()
+
+
+class TimestampFormatter:
+    """``[%Y-%m-%d %H:%M:%S.%e]`` of a time.time() value, as in the default spdlog pattern. strftime runs once per
+    second, not once per line."""
+
+    def __init__(self):
+        self._second = None
+        self._prefix = ""
+
+    def __call__(self, timestamp: float) -> str:
+        second = int(timestamp)
+        if second != self._second:
+            self._second = second
+            self._prefix = time.strftime("[%Y-%m-%d %H:%M:%S", time.localtime(second))
+        return f"{self._prefix}.{int((timestamp - second) * 1000):03d}]"
+
+
+class AthenaRotatingFileLogger:
+    """spdlog‑like text logger on top of :class:`AthenaRotatingFile`, same layout as the default file pattern:
+    ``[%Y-%m-%d %H:%M:%S.%e] [level] message``."""
+
+    def __init__(self, name: str, path: str, retention: dict = None, rotate_existing: bool = False):
+        self.name = name
+        self._file = AthenaRotatingFile(path, retention, rotate_existing)
+        self._level = LEVEL_IDS["info"]
+        self._stamp = TimestampFormatter()
+
+    @property
+    def path(self) -> str:
+        return self._file.path
+
+    def set_level(self, level):
+        self._level = int(level)  # spdlog.LogLevel values share the LEVEL_IDS order
+
+    def set_pattern(self, pattern):
+        pass  # Fixed layout
+
+    def _log(self, level: str, msg: str, timestamp: float = None):
+        if LEVEL_IDS[level] < self._level:
+            return
+        line = f"{self._stamp(time.time() if timestamp is None else timestamp)} [{LEVEL_NAMES[level]}] {msg}\n"
+        self._file.write(line.encode("utf-8"))
+
+    def log_at(self, level: str, msg: str, timestamp: float):
+        """Write a record that happened at *timestamp* (async pipeline: the writer thread runs later)."""
+        self._log(level, msg, timestamp)
+
+    def trace(self, msg):
+        self._log("trace", msg)
+
+    def debug(self, msg):
+        self._log("debug", msg)
+
+    def info(self, msg):
+        self._log("info", msg)
+
+    def warn(self, msg):
+        self._log("warn", msg)
+
+    def warning(self, msg):
+        self._log("warning", msg)
+
+    def error(self, msg):
+        self._log("error", msg)
+
+    def critical(self, msg):
+        self._log("critical", msg)
+
+    def flush(self):
+        self._file.flush()
+
+    def close(self):
+        self._file.close()
@@ -0,0 +1,293 @@
+# # Athena metrics – counters, gauges and histograms with labels, aggregated per thread, exported to a file
+import bisect
+import math
+import os
+import threading
+import time
+
+import msgpack
+
+DEFAULT_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+class _Metric:
+    kind = ""
+
+    def __init__(self, registry: "AthenaMetricsRegistry", name: str, help: str, labelnames):
+        self._registry = registry
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+        self._keys = {}  # Label items as passed -> canonical series key, so hot paths skip the conversion
+
+    def _key(self, labels: dict) -> tuple:
+        items = tuple(labels.items())
+        key = self._keys.get(items)
+        if key is None:
+            if sorted(labels) != sorted(self.labelnames):
+                raise ValueError(f"Metric '{self.name}' expects the labels {self.labelnames}, got {tuple(labels)}.")
+            key = self._keys[items] = (self.name, tuple(str(labels[label]) for label in self.labelnames))
+        return key
+
+
+class Counter(_Metric):
+    """Monotonic sum. ``inc`` only touches the calling thread's shard."""
+
+    kind = "counter"
+
+    def inc(self, amount: float = 1.0, **labels):
+        shard = self._registry._shard()
+        key = self._key(labels)
+        shard[key] = shard.get(key, 0.0) + amount
+
+
+class Histogram(_Metric):
+    """Bucketed distribution (cumulative on export, Prometheus style) plus sum and count, per thread shard."""
+
+    kind = "histogram"
+
+    def __init__(self, registry, name, help, labelnames, buckets=DEFAULT_BUCKETS):
+        super().__init__(registry, name, help, labelnames)
+        self.buckets = tuple(sorted(buckets))
+
+    def observe(self, value: float, **labels):
+        shard = self._registry._shard()
+        key = self._key(labels)
+        cell = shard.get(key)
+        if cell is None:
+            cell = shard[key] = [[0] * (len(self.buckets) + 1), 0.0, 0]  # bucket counts (last is +Inf), sum, count
+        cell[0][bisect.bisect_left(self.buckets, value)] += 1
+        cell[1] += value
+        cell[2] += 1
+
+    def time(self, **labels):
+        """``with histogram.time(job="x"):`` – observe the duration of the block."""
+        return _Timer(self, labels)
+
+
+class _Timer:
+    __slots__ = ("_histogram", "_labels", "_start")
+
+    def __init__(self, histogram: Histogram, labels: dict):
+        self._histogram = histogram
+        self._labels = labels
+
+    def __enter__(self):
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self._histogram.observe(time.perf_counter() - self._start, **self._labels)
+        return False
+
+
+class Gauge(_Metric):
+    """Last value wins, so gauges are not sharded: ``set`` is a single dict assignment. ``track`` registers a
+    callable read at collection time instead (queue depths, job counts...), which costs nothing in between."""
+
+    kind = "gauge"
+
+    def __init__(self, registry, name, help, labelnames):
+        super().__init__(registry, name, help, labelnames)
+        self._values = {}
+        self._functions = {}
+
+    def set(self, value: float, **labels):
+        self._values[self._key(labels)[1]] = value
+
+    def inc(self, amount: float = 1.0, **labels):
+        with self._registry._lock:
+            key = self._key(labels)[1]
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def dec(self, amount: float = 1.0, **labels):
+        self.inc(-amount, **labels)
+
+    def track(self, function, **labels):
+        self._functions[self._key(labels)[1]] = function
+
+    def _collect(self) -> dict:
+        values = dict(self._values)
+        for key, function in list(self._functions.items()):
+            try:
+                values[key] = float(function())
+            except Exception:
+                pass  # A tracked object that went away – skip it this time
+        return values
+
+
+class AthenaMetricsRegistry:
+    """Registry of metrics. Counters and histograms write into a dict owned by the calling thread (no lock, no
+    contention); :meth:`collect` sums the shards of every thread, folding the shards of finished threads into a
+    retired one so they do not pile up."""
+
+    def __init__(self):
+        self._metrics = {}
+        self._local = threading.local()
+        self._shards = []  # (thread, shard)
+        self._retired = {}
+        self._lock = threading.Lock()
+
+    def _shard(self) -> dict:
+        try:
+            return self._local.shard
+        except AttributeError:
+            shard = self._local.shard = {}
+            with self._lock:
+                self._shards.append((threading.current_thread(), shard))
+            return shard
+
+    def _register(self, cls, name, help, labelnames, **kwargs):
+        with self._lock:
+            metric = self._metrics.get(name)
+            if metric is None:
+                metric = self._metrics[name] = cls(self, name, help, labelnames, **kwargs)
+            elif not isinstance(metric, cls) or metric.labelnames != tuple(labelnames):
+                raise ValueError(f"Metric '{name}' is already registered as a {metric.kind} {metric.labelnames}.")
+        return metric
+
+    def counter(self, name: str, help: str = "", labelnames=()) -> Counter:
+        return self._register(Counter, name, help, labelnames)
+
+    def gauge(self, name: str, help: str = "", labelnames=()) -> Gauge:
+        return self._register(Gauge, name, help, labelnames)
+
+    def histogram(self, name: str, help: str = "", labelnames=(), buckets=DEFAULT_BUCKETS) -> Histogram:
+        return self._register(Histogram, name, help, labelnames, buckets=buckets)
+
+    @staticmethod
+    def _merge(total: dict, key, value):
+        if isinstance(value, list):
+            cell = total.get(key)
+            if cell is None:
+                total[key] = [list(value[0]), value[1], value[2]]
+            else:
+                cell[0] = [a + b for a, b in zip(cell[0], value[0])]
+                cell[1] += value[1]
+                cell[2] += value[2]
+        else:
+            total[key] = total.get(key, 0.0) + value
+
+    def collect(self) -> dict:
+        """{metric name: (metric, {label values: value})}. Histogram values are [bucket counts, sum, count]."""
+        with self._lock:
+            alive = []
+            for thread, shard in self._shards:
+                if not thread.is_alive():
+                    for key, value in list(shard.items()):
+                        self._merge(self._retired, key, value)
+                else:
+                    alive.append((thread, shard))
+            self._shards = alive
+            totals = {}
+            for key, value in self._retired.items():
+                self._merge(totals, key, value)
+            for _, shard in alive:
+                for key, value in list(shard.items()):  # list() copies under the GIL – the owner may keep writing
+                    self._merge(totals, key, value)
+            metrics = dict(self._metrics)
+
+        collected = {name: (metric, {}) for name, metric in metrics.items()}
+        for (name, labels), value in totals.items():
+            collected[name][1][labels] = value
+        for name, metric in metrics.items():
+            if isinstance(metric, Gauge):
+                collected[name][1].update(metric._collect())
+        return collected
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\"", "\\\"").replace("\n", "\\n")
+
+
+def _labels_text(names, values, extra: str = "") -> str:
+    parts = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        parts.append(extra)
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+
+def _number(value: float) -> str:
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    return repr(float(value))
+
+
+def to_prometheus_text(collected: dict) -> str:
+    """Prometheus text exposition format (version 0.0.4)."""
+    lines = []
+    for name, (metric, series) in sorted(collected.items()):
+        if metric.help:
+            lines.append(f"# HELP {name} {_escape(metric.help)}")
+        lines.append(f"# TYPE {name} {metric.kind}")
+        for labels, value in sorted(series.items()):
+            if metric.kind != "histogram":
+                lines.append(f"{name}{_labels_text(metric.labelnames, labels)} {_number(value)}")
+                continue
+            counts, total, count = value
+            cumulative = 0
+            for bound, bucket in zip(metric.buckets + (math.inf,), counts):
+                cumulative += bucket
+                le = f'le="{_number(bound)}"'
+                lines.append(f"{name}_bucket{_labels_text(metric.labelnames, labels, le)} {cumulative}")
+            lines.append(f"{name}_sum{_labels_text(metric.labelnames, labels)} {_number(total)}")
+            lines.append(f"{name}_count{_labels_text(metric.labelnames, labels)} {count}")
+    return "\n".join(lines) + "\n"
+
+
+def to_msgpack(collected: dict) -> bytes:
+    """{"timestamp", "metrics": {name: {"type", "help", "labels", "buckets"?, "series": [[label values, value]]}}}"""
+    metrics = {}
+    for name, (metric, series) in collected.items():
+        entry = {"type": metric.kind, "help": metric.help, "labels": list(metric.labelnames),
+                 "series": [[list(labels), value] for labels, value in series.items()]}
+        if metric.kind == "histogram":
+            entry["buckets"] = list(metric.buckets)
+        metrics[name] = entry
+    return msgpack.packb({"timestamp": time.time(), "metrics": metrics})
+
+
+class AthenaMetricsExporter:
+    """Writes a snapshot of *registry* to *path* every *interval* seconds from a background thread, atomically
+    (temporary file + rename) so a collector never reads a partial file. ``.msgpack`` paths get msgpack, anything
+    else the Prometheus text format (e.g. for node_exporter's textfile collector)."""
+
+    def __init__(self, registry: "AthenaMetricsRegistry", path: str = "logs/athena_metrics.prom", interval: float = 10.0):
+        self._registry = registry
+        self._path = path
+        self._interval = interval
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self):
+        if self._thread is None:
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._loop, name="athena_metrics_exporter", daemon=True)
+            self._thread.start()
+
+    def stop(self):
+        """Stop the exporter thread and write one last snapshot."""
+        thread, self._thread = self._thread, None
+        if thread is not None:
+            self._stop.set()
+            thread.join()
+            self.export()
+
+    def _loop(self):
+        while not self._stop.wait(self._interval):
+            self.export()
+
+    def export(self):
+        collected = self._registry.collect()
+        os.makedirs(os.path.dirname(self._path) or ".", exist_ok=True)
+        if self._path.endswith(".msgpack"):
+            data = to_msgpack(collected)
+        else:
+            data = to_prometheus_text(collected).encode("utf-8")
+        with open(self._path + ".tmp", "wb") as fd:
+            fd.write(data)
+        os.replace(self._path + ".tmp", self._path)
+
+
+# Process wide registry used by the scheduler, the logs, the resource loader and the application updates
+METRICS = AthenaMetricsRegistry()
@@ -0,0 +1,109 @@
+# # Athena memory profiler – tracemalloc snapshots attributed to the application packages
+import os
+import tracemalloc
+
+
+class AthenaMemoryProfiler:
+    """Opt‑in memory attribution per application package (``applications/<name>/``).
+
+    An allocation belongs to an application when any frame of its traceback lies in that application's directory,
+    so memory allocated by numpy, dpg or ``IApplication`` on behalf of an application is attributed to it, as long as
+    the call went through its code. Tracebacks keep *nframe* frames: deep call chains may need more.
+
+    Each :meth:`snapshot` logs, per application, the retained memory and the allocation sites that grew the most
+    since the previous snapshot, and warns once when an application goes over its threshold (re‑armed when it drops
+    back under). *thresholds* overrides *threshold* per application name.
+    """
+
+    def __init__(self, base: "ImGUIAthenaApp", applications_dir: str = "applications", threshold: int = 256 * 1024 * 1024,
+                 thresholds: dict = None, nframe: int = 32, top: int = 5):
+        self._base = base
+        self._applications_dir = os.path.abspath(applications_dir)
+        self._threshold = threshold
+        self._thresholds = thresholds or {}
+        self._nframe = nframe
+        self._top = top
+        self._previous = {}  # Application -> its filtered snapshot at the previous call
+        self._alerted = set()
+        self._started_tracing = False
+
+    @property
+    def running(self) -> bool:
+        return tracemalloc.is_tracing()
+
+    def start(self):
+        """Start tracing (allocations made before are invisible, so start before mounting the applications)."""
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(self._nframe)
+            self._started_tracing = True
+        self._base._logs.ap.info(f"[Memory] tracing allocations ({self._nframe} frames per traceback)")
+
+    def stop(self):
+        if self._started_tracing:
+            tracemalloc.stop()
+            self._started_tracing = False
+        self._previous.clear()
+
+    def _applications(self) -> list:
+        try:
+            return sorted(
+                name for name in os.listdir(self._applications_dir)
+                if os.path.isfile(os.path.join(self._applications_dir, name, "application.py"))
+            )
+        except OSError:
+            return []
+
+    def _app_frame(self, traceback, app_dir: str):
+        """Most recent frame of *traceback* inside *app_dir* – where the application asked for the memory."""
+        for frame in reversed(traceback):  # Oldest to most recent since Python 3.7
+            if frame.filename.startswith(app_dir):
+                return frame
+        return traceback[-1]
+
+    def snapshot(self) -> dict:
+        """Take a snapshot; returns {application: {"retained", "blocks", "growth": [(site, bytes, blocks), ...]}}."""
+        if not tracemalloc.is_tracing():
+            return {}
+        snapshot = tracemalloc.take_snapshot().filter_traces((
+            tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+        ))
+        report = {}
+        for name in self._applications():
+            app_dir = os.path.join(self._applications_dir, name) + os.sep
+            # Filtering runs in C: keeps the traces with at least one frame inside the application
+            app_snapshot = snapshot.filter_traces((tracemalloc.Filter(True, app_dir + "*", all_frames=True),))
+            statistics = app_snapshot.statistics("filename")
+            retained = sum(stat.size for stat in statistics)
+            blocks = sum(stat.count for stat in statistics)
+
+            growth = []
+            previous = self._previous.get(name)
+            if previous is not None:
+                # compare_to sorts on abs(size_diff): keep the growing sites before taking the top ones
+                growing = [diff for diff in app_snapshot.compare_to(previous, "traceback") if diff.size_diff > 0]
+                for diff in growing[:self._top]:
+                    frame = self._app_frame(diff.traceback, app_dir)
+                    site = f"{os.path.relpath(frame.filename)}:{frame.lineno}"
+                    growth.append((site, diff.size_diff, diff.count_diff))
+            self._previous[name] = app_snapshot
+            report[name] = {"retained": retained, "blocks": blocks, "growth": growth}
+            self._log(name, report[name])
+        return report
+
+    def _log(self, name: str, stats: dict):
+        logs = self._base._logs
+        logs.ap.info(f"[Memory] {name}: {stats['retained'] / 1024 / 1024:.2f} MiB retained in {stats['blocks']} blocks")
+        for site, size, count in stats["growth"]:
+            logs.ap.info(f"[Memory] {name}: +{size / 1024:.1f} KiB (+{count} blocks) at {site}")
+
+        threshold = self._thresholds.get(name, self._threshold)
+        if stats["retained"] > threshold:
+            if name not in self._alerted:
+                self._alerted.add(name)
+                message = (f"[Memory] {name} retains {stats['retained'] / 1024 / 1024:.2f} MiB, "
+                           f"over its {threshold / 1024 / 1024:.2f} MiB threshold")
+                logs.ap.warning(message)
+                logs.ac.warning(message)
+        else:
+            self._alerted.discard(name)
@@ -1 +1,151 @@
-# Athena internal profiling
\ No newline at end of file
+# Athena internal profiling
+import collections
+import itertools
+import json
+import os
+import threading
+import time
+from functools import wraps
+
+
+class _NullSpan:
+    """Returned by span() while tracing is off: entering and leaving it costs two empty method calls."""
+
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+_NULL_SPAN = _NullSpan()
+
+
+class _Span:
+    __slots__ = ("_tracer", "_name", "_category", "_args", "_start")
+
+    def __init__(self, tracer: "AthenaTracer", name: str, category: str, args: dict):
+        self._tracer = tracer
+        self._name = name
+        self._category = category
+        self._args = args
+
+    def __enter__(self):
+        self._start = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, *exc):
+        self._tracer.complete(self._name, self._category, self._start, time.perf_counter_ns(), self._args)
+        return False
+
+
+class AthenaTracer:
+    """Records nested spans into per‑thread buffers and exports them as Chrome trace events (Perfetto, about:tracing).
+
+    Each thread appends (name, category, start, end, args) tuples to its own bounded deque, so recording takes no
+    lock; nesting comes from the time ranges of the spans of a thread. Spans that do not nest on the thread recording
+    them (background job runs, overlapping each other) go through :meth:`complete_async` instead and are exported as
+    async begin/end pairs with their own id. Nothing is recorded until :meth:`start`.
+    """
+
+    def __init__(self, capacity_per_thread: int = 200_000):
+        self._capacity = capacity_per_thread
+        self._local = threading.local()
+        self._buffers = {}  # thread id -> (thread name, deque)
+        self._lock = threading.Lock()  # Only taken when a thread records its first span
+        self._ids = itertools.count(1)  # Async span ids
+        self.enabled = False
+
+    def start(self):
+        self.enabled = True
+
+    def stop(self):
+        self.enabled = False
+
+    def clear(self):
+        with self._lock:
+            for _, buffer in self._buffers.values():
+                buffer.clear()
+
+    def _buffer(self) -> collections.deque:
+        try:
+            return self._local.buffer
+        except AttributeError:
+            thread = threading.current_thread()
+            buffer = self._local.buffer = collections.deque(maxlen=self._capacity)
+            with self._lock:
+                self._buffers[thread.ident] = (thread.name, buffer)
+            return buffer
+
+    def span(self, name: str, category: str = "athena", **args):
+        """``with tracer.span("load", "resources"):`` – a no‑op while tracing is off."""
+        if not self.enabled:
+            return _NULL_SPAN
+        return _Span(self, name, category, args or None)
+
+    def trace(self, name: str = None, category: str = "athena"):
+        """Decorator form of :meth:`span`, named after the function by default."""
+        def decorator(func):
+            span_name = name or func.__qualname__
+
+            @wraps(func)
+            def wrapper(*args, **kwargs):
+                if not self.enabled:
+                    return func(*args, **kwargs)
+                start = time.perf_counter_ns()
+                try:
+                    return func(*args, **kwargs)
+                finally:
+                    self.complete(span_name, category, start, time.perf_counter_ns())
+            return wrapper
+        return decorator
+
+    def complete(self, name: str, category: str, start_ns: int, end_ns: int, args: dict = None):
+        """Record a span measured by the caller (perf_counter_ns clock) on the current thread."""
+        if self.enabled:
+            self._buffer().append((name, category, start_ns, end_ns, args))
+
+    def complete_async(self, name: str, category: str, start_ns: int, end_ns: int, args: dict = None):
+        """Record a span that may overlap other spans of the current thread (exported as "b"/"e" events)."""
+        if self.enabled:
+            self._buffer().append((name, category, start_ns, end_ns, args, next(self._ids)))
+
+    def events(self) -> list:
+        """Chrome trace events of everything recorded so far (complete "X" events, async "b"/"e" pairs and thread
+        names)."""
+        pid = os.getpid()
+        events = []
+        with self._lock:
+            buffers = [(tid, name, list(buffer)) for tid, (name, buffer) in self._buffers.items()]
+        for tid, thread_name, spans in buffers:
+            events.append({"ph": "M", "name": "thread_name", "pid": pid, "tid": tid, "args": {"name": thread_name}})
+            for name, category, start, end, args, *run_id in spans:
+                if run_id:
+                    begin = {"ph": "b", "name": name, "cat": category, "id": run_id[0], "pid": pid, "tid": tid,
+                             "ts": start / 1000.0}
+                    if args:
+                        begin["args"] = args
+                    events.append(begin)
+                    events.append({"ph": "e", "name": name, "cat": category, "id": run_id[0], "pid": pid, "tid": tid,
+                                   "ts": end / 1000.0})
+                    continue
+                event = {"ph": "X", "name": name, "cat": category, "pid": pid, "tid": tid,
+                         "ts": start / 1000.0, "dur": (end - start) / 1000.0}
+                if args:
+                    event["args"] = args
+                events.append(event)
+        return events
+
+    def export_chrome_trace(self, path: str) -> int:
+        """Write the recorded spans as Chrome trace‑event JSON. Returns the number of events written."""
+        events = self.events()
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        with open(path, "w", encoding="utf-8") as fd:
+            json.dump({"traceEvents": events, "displayTimeUnit": "ms"}, fd, default=str)
+        return len(events)
+
+
+# Process wide tracer used by internal_log_profiling, AthenaOClock and the render loop
+TRACER = AthenaTracer()
@@ -0,0 +1,171 @@
+# # Athena sampling profiler – background stack sampling, collapsed stacks and SVG flamegraphs
+import collections
+import html
+import os
+import sys
+import threading
+import time
+
+
+class AthenaSamplingProfiler:
+    """Samples the stacks of the UI and worker threads from a background thread, whatever is decorated or not.
+
+    Every *interval* seconds the profiler reads ``sys._current_frames()`` and counts one hit for the stack of each
+    thread whose name starts with one of *threads* (the UI thread and the AthenaOClock pool by default). Stacks are
+    counted as tuples of code objects and only turned into text when written. The profiler times its own sampling and
+    stretches the interval whenever it would take more than *max_overhead* of the wall time.
+
+    :meth:`stop` writes ``<name>.folded`` (collapsed stacks, the flamegraph.pl / speedscope input) and ``<name>.svg``.
+    """
+
+    def __init__(self, base: "ImGUIAthenaApp", interval: float = 0.005, threads=("MainThread", "athena_o_clock"),
+                 output_dir: str = "logs/profiles", max_overhead: float = 0.02, max_depth: int = 128):
+        self._base = base
+        self._interval = interval
+        self._threads = tuple(threads)
+        self._output_dir = output_dir
+        self._max_overhead = max_overhead
+        self._max_depth = max_depth
+
+        self._stacks = collections.Counter()  # (thread name, code, code, ...) root first -> samples
+        self._thread = None
+        self._stop = threading.Event()
+        self._samples = 0
+        self._sampling_time = 0.0
+        self._started = 0.0
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None
+
+    def start(self):
+        if self._thread is not None:
+            return
+        self._stacks.clear()
+        self._samples, self._sampling_time = 0, 0.0
+        self._stop.clear()
+        self._started = time.perf_counter()
+        self._thread = threading.Thread(target=self._sample_loop, name="athena_sampling_profiler", daemon=True)
+        self._thread.start()
+        self._base._logs.ap.info(f"[Profiler] sampling every {self._interval * 1000:.1f} ms")
+
+    def stop(self):
+        """Stop sampling and write the profile files. Returns (folded path, svg path), or None if not running."""
+        thread, self._thread = self._thread, None
+        if thread is None:
+            return None
+        self._stop.set()
+        thread.join()
+        wall = time.perf_counter() - self._started
+        name = os.path.join(self._output_dir, time.strftime("profile-%Y%m%d-%H%M%S"))
+        folded = self.folded()
+        os.makedirs(self._output_dir, exist_ok=True)
+        with open(name + ".folded", "w", encoding="utf-8") as fd:
+            fd.writelines(f"{stack} {count}\n" for stack, count in folded.items())
+        with open(name + ".svg", "w", encoding="utf-8") as fd:
+            fd.write(flamegraph_svg(folded, title=f"Athena – {self._samples} samples over {wall:.1f} s"))
+        self._base._logs.ap.info(
+            f"[Profiler] {self._samples} samples, overhead {self._sampling_time / max(wall, 1e-9):.2%}, "
+            f"written to {name}.folded / .svg"
+        )
+        return name + ".folded", name + ".svg"
+
+    def toggle(self):
+        return self.stop() if self.running else self.start()
+
+    # ----------------------------------------------------------------------------------
+    # Sampling
+    # ----------------------------------------------------------------------------------
+
+    def _sample_loop(self):
+        own = threading.get_ident()
+        interval = self._interval
+        names, names_refreshed = {}, 0.0
+        while not self._stop.wait(interval):
+            started = time.perf_counter()
+            if started - names_refreshed > 1.0:  # Thread names change rarely – no need to enumerate every sample
+                names = {
+                    thread.ident: thread.name for thread in threading.enumerate()
+                    if thread.name.startswith(self._threads)
+                }
+                names_refreshed = started
+            for ident, frame in sys._current_frames().items():
+                name = names.get(ident)
+                if name is None or ident == own:
+                    continue
+                codes = []
+                while frame is not None and len(codes) < self._max_depth:
+                    codes.append(frame.f_code)
+                    frame = frame.f_back
+                codes.append(name)
+                codes.reverse()
+                self._stacks[tuple(codes)] += 1
+            self._samples += 1
+            cost = time.perf_counter() - started
+            self._sampling_time += cost
+            # Keep cost / interval under the overhead budget
+            interval = max(self._interval, cost / self._max_overhead)
+
+    def folded(self) -> dict:
+        """Collapsed stacks: "thread;root;...;leaf" -> samples. Frames read ``function (file:line)``."""
+        labels = {}
+        folded = collections.Counter()
+        for stack, count in list(self._stacks.items()):
+            parts = [stack[0]]
+            for code in stack[1:]:
+                label = labels.get(code)
+                if label is None:
+                    label = labels[code] = f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})"
+                parts.append(label)
+            folded[";".join(parts)] += count
+        return dict(folded)
+
+
+def flamegraph_svg(folded: dict, title: str = "Flamegraph", width: int = 1200, frame_height: int = 16) -> str:
+    """Render collapsed stacks as a static SVG flamegraph (root at the bottom, hover a frame for its samples)."""
+    root = {"children": {}, "count": 0}
+    for stack, count in folded.items():
+        node = root
+        node["count"] += count
+        for part in stack.split(";"):
+            node = node["children"].setdefault(part, {"children": {}, "count": 0})
+            node["count"] += count
+
+    def depth(node):
+        return 1 + max((depth(child) for child in node["children"].values()), default=0)
+
+    levels = depth(root) - 1
+    height = (levels + 2) * frame_height + 10
+    total = max(root["count"], 1)
+    rects = []
+
+    def draw(node, name, x, level):
+        frame_width = node["count"] / total * (width - 20)
+        if frame_width < 0.5:
+            return
+        y = height - (level + 1) * frame_height - 5
+        hue = 20 + sum(map(ord, name)) % 40  # Stable warm colors per frame name
+        tooltip = html.escape(f"{name} ({node['count']} samples, {node['count'] / total:.2%})")
+        rects.append(
+            f'<g><title>{tooltip}</title><rect x="{x:.1f}" y="{y}" width="{frame_width:.1f}" height="{frame_height - 1}" '
+            f'fill="hsl({hue},80%,60%)"/>'
+            + (f'<text x="{x + 3:.1f}" y="{y + frame_height - 4}">{html.escape(name[:int(frame_width / 7)])}</text>'
+               if frame_width > 30 else "")
+            + "</g>"
+        )
+        child_x = x
+        for child_name, child in sorted(node["children"].items()):
+            draw(child, child_name, child_x, level + 1)
+            child_x += child["count"] / total * (width - 20)
+
+    x = 10.0
+    for name, child in sorted(root["children"].items()):
+        draw(child, name, x, 0)
+        x += child["count"] / total * (width - 20)
+
+    return (
+        f'<svg xmlns="http://www.w3.org/2000/svg" width="{width}" height="{height}" font-family="monospace" font-size="11">'
+        f'<rect width="100%" height="100%" fill="#f8f8f8"/>'
+        f'<text x="10" y="{frame_height}" font-size="13">{html.escape(title)}</text>'
+        + "".join(rects) + "</svg>\n"
+    )
@@ -0,0 +1,96 @@
+# # Athena stall watchdog – catches UI-thread frames that run too long, with the stack that was running
+import sys
+import threading
+import time
+import traceback
+
+from sources.core.metrics.athena_metrics import METRICS
+
+UI_STALLS = METRICS.counter("athena_ui_stalls_total", "UI frames that went over the stall threshold")
+
+
+class AthenaStallWatchdog:
+    """Background thread checking that the render loop keeps calling :meth:`heartbeat`.
+
+    When the current frame has been running for more than *threshold* seconds, the watchdog captures the main
+    thread's Python stack together with what Athena was doing (running AthenaOClock job, application update) and
+    writes it to the ``athena_stalls`` log. Captures are rate‑limited to one per *min_interval* seconds; stalls seen
+    in between are counted and reported with the next capture. The end of each captured stall is logged with its
+    total duration.
+    """
+
+    def __init__(self, base: "ImGUIAthenaApp", threshold: float = 1.0, min_interval: float = 30.0):
+        self._base = base
+        self._threshold = threshold
+        self._min_interval = min_interval
+        self._poll = threshold / 4.0
+
+        self._beat = 0.0  # Start of the current frame, 0 until the loop runs
+        self._main_ident = threading.main_thread().ident
+        self._thread = None
+        self._stop = threading.Event()
+        self._last_capture = -float("inf")
+        self._captured_beat = None  # Heartbeat of the stall captured last, to log its end
+        self._stalled_beat = None  # Heartbeat of the stall seen last, to count each stall once
+        self._uncaptured = 0
+
+    def heartbeat(self):
+        """Called by the render loop at the start of every frame (a single attribute store)."""
+        self._beat = time.perf_counter()
+
+    def start(self):
+        if self._thread is None:
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._watch, name="athena_stall_watchdog", daemon=True)
+            self._thread.start()
+
+    def stop(self):
+        thread, self._thread = self._thread, None
+        if thread is not None:
+            self._stop.set()
+            thread.join()
+
+    def _activity(self) -> str:
+        """What the UI thread is running, according to the scheduler and the application updates."""
+        activity = []
+        job = self._base._oclock.running_job
+        if job is not None:
+            activity.append(f"job '{job}'")
+        app = self._base._updating_application
+        if app is not None:
+            activity.append(f"IApplication.update of '{app}'")
+        return ", ".join(activity) or "no job or application update"
+
+    def _watch(self):
+        while not self._stop.wait(self._poll):
+            beat = self._beat
+            now = time.perf_counter()
+            if self._captured_beat is not None and beat != self._captured_beat:
+                self._log.warning(f"[Stall] ended, frame took {beat - self._captured_beat:.3f} seconds")
+                self._captured_beat = None
+            if not beat or now - beat < self._threshold or beat == self._stalled_beat:
+                continue
+
+            self._stalled_beat = beat
+            UI_STALLS.inc()
+            if now - self._last_capture < self._min_interval:
+                self._uncaptured += 1
+                continue
+            self._last_capture = now
+            self._captured_beat = beat
+            self._capture(now - beat)
+
+    def _capture(self, elapsed: float):
+        frame = sys._current_frames().get(self._main_ident)
+        stack = "".join(traceback.format_stack(frame)) if frame is not None else "  <main thread stack unavailable>\n"
+        skipped = f", {self._uncaptured} stalls not captured since the previous capture" if self._uncaptured else ""
+        self._uncaptured = 0
+        self._log.warning(
+            f"[Stall] UI frame running for {elapsed:.3f} seconds (threshold {self._threshold:.3f}) in "
+            f"{self._activity()}{skipped}\n{stack.rstrip()}"
+        )
+        self._base._logs.ap.warning(f"[Stall] UI frame running for {elapsed:.3f} seconds, see logs/athena_stalls.log")
+
+    @property
+    def _log(self):
+        return self._base._logs["athena_stalls"]
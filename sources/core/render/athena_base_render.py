@@ -65,14 +65,39 @@ def get_first_item(parent):
     return None
 
 
+import asyncio
+import collections
+import heapq
+import queue
 import threading
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
 from dataclasses import dataclass, field
-from typing import Callable, Any, Dict, Tuple
+from typing import Callable, Any, Deque, Dict, Generator, List, Optional, Set, Tuple
+
+from sources.core.scheduler.athena_clocks import AthenaWallClock
+from sources.core.scheduler.athena_job_pipelines import AthenaJobPipeline
+from sources.core.scheduler.athena_job_stats import JobStats
+from sources.core.scheduler.athena_process_pool import SHARED_MEMORY_THRESHOLD, run_process_job, unpack_result
+from sources.core.metrics.athena_metrics import METRICS, AthenaMetricsExporter
 
 # ----------------------------------------------------------------------------------------------------------------------
 # Job scheduler – a light wrapper around time‑based callbacks that can run in the UI loop or a thread
 # ----------------------------------------------------------------------------------------------------------------------
 
+# What to do when a background (threaded, process, coroutine, cooperative or pipeline) job is due while its previous run is still in flight:
+#   skip       – drop the new run
+#   coalesce   – merge every missed run into a single one started as soon as the current run ends
+#   queue_one  – queue the first missed run behind the current one, drop any further one
+#   concurrent – run anyway on another worker, up to one run per pool worker; a tick beyond that is skipped
+OVERRUN_POLICIES = ("skip", "coalesce", "queue_one", "concurrent")
+
+JOB_RUNS = METRICS.counter("athena_job_runs_total", "Job runs completed", ("job", "mode"))
+JOB_DURATION = METRICS.histogram("athena_job_duration_seconds", "Job run time (submit to completion for background runs)", ("job",))
+JOB_LAG = METRICS.histogram("athena_job_lag_seconds", "Job start lag against its scheduled time", ("job",))
+JOB_OVERRUNS = METRICS.counter("athena_job_overruns_total", "Job ticks hitting a run still in flight, by overrun policy", ("job", "policy"))
+APP_UPDATE_DURATION = METRICS.histogram("athena_app_update_seconds", "IApplication.update run time", ("app",))
+
+
 @dataclass
 class Job:
     """A scheduled unit of work executed by :class:`AthenaOClock`."""
@@ -83,21 +108,277 @@ class Job:
     limit: int = 0  # 0 == unlimited executions
     threaded: bool = False
     threaded_args: Tuple[Any, ...] = field(default_factory=tuple)
+    overrun: str = "skip"  # One of OVERRUN_POLICIES, only meaningful for background jobs
+    process: bool = False  # Run on the persistent process pool (CPU‑bound work, *job* must be picklable)
+    on_result: Optional[Callable] = None  # Called on the UI thread with the return value of a background run
+    coroutine: bool = False  # *job* is an ``async def`` – runs on the scheduler's asyncio loop (set by add_job)
+    cooperative: bool = False  # *job* is a generator – resumed on the UI thread within the frame budget (set by add_job)
+    pipeline: bool = False  # *job* is an AthenaJobPipeline – stages run as their inputs finish (set by add_pipeline)
 
     # The following fields are filled internally – no need to touch them when creating a job.
     c_time: float = field(default_factory=time.time)  # Time of last execution
     c_limit: int = 0  # How many times we have executed so far
+    next_time: float = 0.0  # Time at which the job is due again (heap key)
+    c_running: int = 0  # Runs currently in flight on the worker pool
+    c_pending: bool = False  # A coalesced/queued run waits for the current one to finish
+    overruns: Dict[str, int] = field(default_factory=lambda: dict.fromkeys(OVERRUN_POLICIES, 0))
+    c_futures: Set[Future] = field(default_factory=set)  # In‑flight runs, cancelled when the job is removed
+    c_cancelled: bool = False  # Set by remove_job/clear_jobs – stops in‑progress cooperative runs
+    stats: JobStats = field(default_factory=JobStats)  # Start lag / run time histograms, see AthenaOClock.job_stats
+
+    @property
+    def background(self) -> bool:
+        return self.threaded or self.process or self.coroutine or self.cooperative or self.pipeline
+
+    @property
+    def mode(self) -> str:
+        return (
+            "pipeline" if self.pipeline else "process" if self.process else "coroutine" if self.coroutine
+            else "cooperative" if self.cooperative else "threaded" if self.threaded else "inline"
+        )
 
 
 class AthenaOClock:
-    """Minimal scheduler used throughout Athena to update sub‑applications at a fixed rate."""
+    """Minimal scheduler used throughout Athena to update sub‑applications at a fixed rate.
+
+    Jobs are kept in a min‑heap keyed on their next due time, so a frame only touches the jobs that are actually
+    due. Removal is lazy: the heap entry of a removed job stays in place and is dropped when it reaches the top.
+    Threaded jobs share a bounded worker pool instead of spawning one thread per run, CPU‑bound jobs go to a
+    persistent process pool and ``async def`` jobs to an asyncio loop running on a dedicated thread. Background
+    results are handed back through a completion queue drained every frame. Generator jobs are cooperative: they
+    are resumed on the UI thread, one ``yield`` at a time, until *frame_budget* seconds of the frame are used up.
 
-    def __init__(self, _base: "ImGUIAthenaApp", delta_update_time: float = 1.0 / 60.0):
+    Time comes from *clock* (wall clock by default). With an :class:`AthenaVirtualClock`, :meth:`run_until` replays
+    the schedule faster than real time by jumping from one due job to the next.
+    """
+
+    def __init__(
+            self,
+            _base: "ImGUIAthenaApp",
+            delta_update_time: float = 1.0 / 60.0,
+            max_workers: int = 4,
+            max_processes: Optional[int] = None,
+            frame_budget: float = 0.004,
+            clock=None,
+    ):
         self._base: "ImGUIAthenaApp" = _base
+        self._clock = clock if clock is not None else AthenaWallClock()
         self._jobs: Dict[str, Job] = {}
-        self._current_update_time = time.time()
+        self._heap: List[Tuple[float, int, Job]] = []  # (next_time, sequence, job)
+        self._sequence = 0  # Tie breaker – keeps registration order for jobs due at the same time
+        self._current_update_time = self._clock.time()
         self._delta_update_time = delta_update_time  # Throttle the *update_jobs* loop itself
         self._lock = threading.Lock()
+        self._max_workers = max_workers
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="athena_o_clock")
+        self._max_processes = max_processes
+        self._process_executor: Optional[ProcessPoolExecutor] = None  # Created on the first process job
+        self._completions: "queue.SimpleQueue[Tuple[Callable, Tuple[Any, ...]]]" = queue.SimpleQueue()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None  # Created on the first coroutine job
+        self._loop_thread: Optional[threading.Thread] = None
+        self._frame_budget = frame_budget  # Seconds per frame granted to cooperative jobs
+        self._cooperative: Deque[Tuple[Job, Generator, float]] = collections.deque()  # (job, run, UI time so far)
+        self._wakeup: Optional[Callable] = None  # Called whenever something is posted for the UI thread
+        self.running_job: Optional[str] = None  # Job or completion callback running on the UI thread (read by the stall watchdog)
+        METRICS.gauge("athena_jobs", "Jobs registered on the scheduler").track(lambda: len(self._jobs))
+        METRICS.gauge("athena_cooperative_runs", "Cooperative runs in progress").track(lambda: len(self._cooperative))
+
+    # ----------------------------------------------------------------------------------
+    # Heap helpers – must be called with *self._lock* held
+    # ----------------------------------------------------------------------------------
+
+    def _push(self, job: Job):
+        self._sequence += 1
+        heapq.heappush(self._heap, (job.next_time, self._sequence, job))
+
+    def _is_alive(self, job: Job) -> bool:
+        return self._jobs.get(job.name) is job
+
+    def _compact(self):
+        """Drop stale heap entries once they outnumber the live jobs."""
+        if len(self._heap) > 2 * len(self._jobs) + 32:
+            self._heap = [entry for entry in self._heap if self._is_alive(entry[2])]
+            heapq.heapify(self._heap)
+
+    # ----------------------------------------------------------------------------------
+    # Worker pool helpers
+    # ----------------------------------------------------------------------------------
+
+    def _dispatch(self, job: Job) -> bool:
+        """Hand *job* to its pool, applying its overrun policy if a previous run is still in flight.
+        Returns True when a run was submitted (a coalesced/queued run counts when it is chained)."""
+        with self._lock:
+            if self._limit_reached(job):
+                return False  # The last allowed run was a chained one
+            if job.c_running:
+                if job.overrun == "skip" or (job.overrun == "queue_one" and job.c_pending) \
+                        or (job.overrun == "concurrent" and job.c_running >= self._capacity(job)):
+                    job.overruns["skip"] += 1
+                    JOB_OVERRUNS.inc(job=job.name, policy="skip")
+                    return False
+                if job.overrun in ("coalesce", "queue_one"):
+                    job.overruns[job.overrun] += 1
+                    JOB_OVERRUNS.inc(job=job.name, policy=job.overrun)
+                    job.c_pending = True
+                    return False
+                job.overruns["concurrent"] += 1
+                JOB_OVERRUNS.inc(job=job.name, policy="concurrent")
+            job.c_running += 1
+            job.c_limit += 1
+        self._submit(job)
+        return True
+
+    def _capacity(self, job: Job) -> int:
+        """Most runs of *job* allowed in flight at once: the size of the pool it runs on."""
+        if job.process:
+            return self._max_processes or os.cpu_count() or 1
+        return self._max_workers
+
+    @staticmethod
+    def _limit_reached(job: Job) -> bool:
+        return job.limit != 0 and job.c_limit >= job.limit
+
+    def _event_loop(self) -> asyncio.AbstractEventLoop:
+        if self._loop is None:
+            self._loop = asyncio.new_event_loop()
+            self._loop_thread = threading.Thread(target=self._loop.run_forever, name="athena_o_clock_asyncio", daemon=True)
+            self._loop_thread.start()
+        return self._loop
+
+    def _cancel_runs(self, job: Job):
+        """Cancel in‑flight runs of *job*. Only coroutines, cooperative runs and not yet started pool runs can
+        actually be stopped."""
+        job.c_cancelled = True
+        for future in list(job.c_futures):
+            future.cancel()
+
+    def _submit(self, job: Job):
+        if job.cooperative:
+            self._cooperative.append((job, job.job(*job.threaded_args), 0.0))
+            return
+        if job.pipeline:
+            future = job.job.start(self._executor.submit, self._post)
+        elif job.coroutine:
+            future = asyncio.run_coroutine_threadsafe(job.job(*job.threaded_args), self._event_loop())
+        elif job.process:
+            if self._process_executor is None:
+                self._process_executor = ProcessPoolExecutor(max_workers=self._max_processes)
+            future = self._process_executor.submit(run_process_job, job.job, job.threaded_args, SHARED_MEMORY_THRESHOLD)
+        else:
+            future = self._executor.submit(job.job, *job.threaded_args)
+        with self._lock:
+            job.c_futures.add(future)
+        future.add_done_callback(lambda f, job=job, started=time.perf_counter(): self._on_done(job, f, started))
+
+    def _on_done(self, job: Job, future: Future, started: float):
+        """Pool side: queue the result for the UI thread, then chain the coalesced/queued run if one was requested."""
+        # Submit ➜ completion, so pool queueing and process round trips are part of a background run time.
+        finished = time.perf_counter()
+        if not future.cancelled():  # A cancelled run never ran: not a completed run
+            self._record_run(job, finished - started)
+            # Runs of concurrent jobs overlap on the pool threads: async events, so they show as separate tracks
+            TRACER.complete_async(job.name, "job", int(started * 1e9), int(finished * 1e9), {"mode": job.mode})
+            try:
+                result = future.result()
+                if job.process:
+                    result = unpack_result(result)  # Copy shared memory arrays out here, not on the UI thread
+                if job.pipeline:
+                    self._log_pipeline_report(result)
+                if job.on_result is not None:
+                    self._post(job.on_result, result, source=f"{job.name} (on_result)")
+            except Exception as e:
+                self._base._logs["aoc"].error(f"Background job '{job.name}' failed: {e}")
+
+        with self._lock:
+            job.c_futures.discard(future)
+        self._finish_run(job)
+
+    @staticmethod
+    def _record_run(job: Job, duration: float):
+        job.stats.record_run(duration)
+        JOB_RUNS.inc(job=job.name, mode=job.mode)
+        JOB_DURATION.observe(duration, job=job.name)
+
+    def _finish_run(self, job: Job):
+        """Release the run slot of *job*, or reuse it for the coalesced/queued run if one was requested."""
+        with self._lock:
+            chain = job.c_pending and self._is_alive(job) and not self._limit_reached(job)
+            job.c_pending = False
+            if chain:
+                job.c_limit += 1
+            else:
+                job.c_running -= 1
+        if chain:
+            try:
+                self._submit(job)
+            except RuntimeError:  # Pool shut down in the meantime
+                with self._lock:
+                    job.c_running -= 1
+
+    def _resume_cooperative(self):
+        """Step cooperative jobs round‑robin until the frame budget is spent; the rest carries over to next frame."""
+        deadline = time.perf_counter() + self._frame_budget
+        while self._cooperative and time.perf_counter() < deadline:
+            job, generator, elapsed = self._cooperative.popleft()
+            if job.c_cancelled:  # Removed or cleared meanwhile
+                generator.close()
+                with self._lock:
+                    job.c_running -= 1
+                continue
+            step = time.perf_counter()
+            self.running_job = job.name
+            try:
+                with TRACER.span(job.name, "job", mode="cooperative"):
+                    next(generator)
+            except StopIteration as stop:
+                # Only the time spent inside the steps counts: that is what the job costs the frame.
+                self._record_run(job, elapsed + time.perf_counter() - step)
+                try:
+                    if job.on_result is not None:
+                        job.on_result(stop.value)
+                except Exception as e:
+                    self._base._logs["aoc"].error(f"on_result of cooperative job '{job.name}' failed: {e}")
+                finally:
+                    self._finish_run(job)  # Always release the run slot, or skip/coalesce never run the job again
+                continue
+            except Exception as e:
+                self._record_run(job, elapsed + time.perf_counter() - step)
+                self._base._logs["aoc"].error(f"Cooperative job '{job.name}' failed: {e}")
+                self._finish_run(job)
+                continue
+            finally:
+                self.running_job = None
+            self._cooperative.append((job, generator, elapsed + time.perf_counter() - step))
+
+    def _post(self, callback: Callable, *args, source: Optional[str] = None):
+        """Queue *callback(*args)* to run on the UI thread during the next *update_jobs*. *source* names it for the
+        stall watchdog (the callback's qualified name by default)."""
+        self._completions.put((callback, args, source))
+        if self._wakeup is not None:
+            self._wakeup()
+
+    def _drain_completions(self):
+        """Run everything posted from the pools (results, UI pipeline stages) on the calling (UI) thread."""
+        while True:
+            try:
+                callback, args, source = self._completions.get_nowait()
+            except queue.Empty:
+                return
+            self.running_job = source or getattr(callback, "__qualname__", repr(callback))
+            try:
+                callback(*args)
+            except Exception as e:
+                # Keep draining: one failing callback must neither stop the frame loop nor hold back the others
+                self._base._logs["aoc"].error(f"Completion callback '{self.running_job}' failed: {e}")
+            finally:
+                self.running_job = None
+
+    def _log_pipeline_report(self, report: Dict[str, Any]):
+        path = " ➜ ".join(report["critical_path"])
+        self._base._logs["aoc"].info(
+            f"Pipeline '{report['pipeline']}' took {report['total']:.4f} seconds, "
+            f"critical path {path} ({report['critical_time']:.4f} seconds)"
+        )
 
     # ----------------------------------------------------------------------------------
     # Public API
@@ -111,58 +392,230 @@ class AthenaOClock:
             limit: int = 0,
             threaded: bool = False,
             threaded_args: Tuple[Any, ...] = (),
+            overrun: str = "skip",
+            process: bool = False,
+            on_result: Optional[Callable] = None,
     ):
         """Register a new task. *delta_time* is expressed in **milliseconds** to stay consistent with
-        DearPyGui's typical timers, but we immediately convert it to seconds internally."""
+        DearPyGui's typical timers, but we immediately convert it to seconds internally.
+
+        ``async def`` callables are detected automatically and awaited on the scheduler's own asyncio loop.
+        Generator functions are detected too and run cooperatively: each ``yield`` hands control back to the frame.
+
+        *process* runs the job on the persistent process pool; large numpy results come back through shared memory.
+        *on_result* receives the return value of threaded/process runs on the UI thread, during *update_jobs*."""
+        self._register(
+            name=name,
+            job=job,
+            delta_time=delta_time / 1000.0,  # ms ➜ s
+            limit=limit,
+            threaded=threaded,
+            threaded_args=threaded_args,
+            overrun=overrun,
+            process=process,
+            on_result=on_result,
+            coroutine=inspect.iscoroutinefunction(job),
+            cooperative=inspect.isgeneratorfunction(job),
+        )
+
+    def add_pipeline(
+            self,
+            name: str,
+            pipeline: AthenaJobPipeline,
+            delta_time: float,
+            limit: int = 0,
+            overrun: str = "skip",
+            on_result: Optional[Callable] = None,
+    ):
+        """Schedule *pipeline* as a single job. *delta_time* is in milliseconds, like :meth:`add_job`; overrun
+        policies apply to whole runs. *on_result* receives the run report (timings and critical path)."""
+        pipeline.stages  # Validate the DAG now rather than on the first tick
+        self._register(
+            name=name,
+            job=pipeline,
+            delta_time=delta_time / 1000.0,  # ms ➜ s
+            limit=limit,
+            overrun=overrun,
+            on_result=on_result,
+            pipeline=True,
+        )
+
+    def _register(self, name: str, overrun: str, **fields):
+        if overrun not in OVERRUN_POLICIES:
+            raise ValueError(f"Unknown overrun policy '{overrun}', expected one of {OVERRUN_POLICIES}.")
         with self._lock:
             if name in self._jobs:
                 raise ValueError(f"Job '{name}' already exists.")
-            self._jobs[name] = Job(
-                name=name,
-                job=job,
-                delta_time=delta_time / 1000.0,  # ms ➜ s
-                limit=limit,
-                threaded=threaded,
-                threaded_args=threaded_args,
-            )
+            _job = Job(name=name, overrun=overrun, c_time=self._clock.time(), **fields)
+            _job.next_time = _job.c_time + _job.delta_time
+            self._jobs[name] = _job
+            self._push(_job)
+
+    def remove_job(self, name: str) -> bool:
+        """Unschedule *name*. Returns False if no such job exists."""
+        with self._lock:
+            job = self._jobs.pop(name, None)
+            if job is None:
+                return False
+            self._compact()
+        self._cancel_runs(job)
+        return True
 
     @internal_log_profiling(section="Athena O'Clock", specific_log="aoc")
     def update_jobs(self):
         """Execute all jobs that are due **once per DearPyGui frame** (or less, depending on *delta_update_time*)."""
-        c_time = time.time()
+        c_time = self._clock.time()
+
+        # Background results are delivered every frame, regardless of the throttle below.
+        self._drain_completions()
 
         # Throttle the update loop itself to avoid needless iterations.
-        if c_time - self._current_update_time < self._delta_update_time:
-            return
-        self._current_update_time = c_time
+        if c_time - self._current_update_time >= self._delta_update_time:
+            self._current_update_time = c_time
+            self._run_due_jobs(c_time)
 
-        to_remove = []  # Collect jobs that reached their execution limit
+        # Cooperative jobs get their slice of every frame, regardless of the throttle.
+        self._resume_cooperative()
 
+    def _run_due_jobs(self, c_time: float):
+        # Pop only the jobs that are due; everything else stays untouched in the heap.
+        due = []
         with self._lock:
-            for name, job in self._jobs.items():
-                if c_time - job.c_time >= job.delta_time:
-                    # Decide whether to run in a background thread or in the main thread.
-                    if job.threaded:
-                        threading.Thread(target=job.job, args=job.threaded_args).start()
-                    else:
-                        job.job(*job.threaded_args)
+            while self._heap and self._heap[0][0] <= c_time:
+                job = heapq.heappop(self._heap)[2]
+                if self._is_alive(job):
+                    due.append(job)
 
-                    # Update bookkeeping.
-                    job.c_time = c_time
+        # Run outside the lock so a job may add or remove jobs itself.
+        try:
+            for job in due:
+                # Start lag against the scheduled time, and how many whole periods went by unserved.
+                lag = self._clock.time() - job.next_time
+                job.stats.record_start(lag, int(lag // job.delta_time) if job.delta_time > 0 else 0)
+                JOB_LAG.observe(lag, job=job.name)
+
+                # Decide whether to run in a worker process, a background thread or in the main thread.
+                if job.background:
+                    ran = self._dispatch(job)
+                else:
+                    started = time.perf_counter()
+                    self.running_job = job.name
+                    try:
+                        with TRACER.span(job.name, "job", mode="inline"):
+                            job.job(*job.threaded_args)
+                    finally:
+                        self.running_job = None
+                        self._record_run(job, time.perf_counter() - started)
                     job.c_limit += 1
+                    ran = True
 
-                    # Remove if we hit the max execution count.
-                    if job.limit != 0 and job.c_limit >= job.limit:
-                        to_remove.append(name)
+                # Update bookkeeping – skipped or coalesced ticks do not count towards the limit.
+                if ran:
+                    job.c_time = c_time
+                job.next_time = c_time + job.delta_time
+        finally:
+            # Jobs that did not get to run (a previous one raised) keep their due time and fire next frame.
+            with self._lock:
+                for job in due:
+                    if not self._is_alive(job):
+                        continue
+                    # Remove if we hit the max execution count, otherwise reschedule.
+                    if self._limit_reached(job):
+                        del self._jobs[job.name]
+                    else:
+                        self._push(job)
+                self._compact()
+
+    @property
+    def clock(self):
+        return self._clock
 
-            # Purge completed jobs outside the main loop.
-            for name in to_remove:
-                del self._jobs[name]
+    def set_wakeup(self, wakeup: Optional[Callable]):
+        """*wakeup()* is called from any thread whenever a result or stage is posted for the UI thread."""
+        self._wakeup = wakeup
+
+    def has_pending_work(self) -> bool:
+        """True while UI‑side work is waiting: cooperative runs in progress or posted results not yet delivered."""
+        return bool(self._cooperative) or not self._completions.empty()
+
+    def next_due_time(self) -> Optional[float]:
+        """Due time of the earliest live job, or None when nothing is scheduled."""
+        with self._lock:
+            while self._heap and not self._is_alive(self._heap[0][2]):
+                heapq.heappop(self._heap)
+            return self._heap[0][0] if self._heap else None
+
+    def run_until(self, end_time: float, max_steps: int = 1_000_000) -> int:
+        """Replay the schedule up to *end_time* on a virtual clock, jumping straight to each due time.
+
+        The frame throttle is bypassed and cooperative jobs are resumed once per step. Inline and cooperative jobs
+        run in exactly the live order; background jobs still complete whenever their pool lets them.
+        Unlimited jobs with a zero interval never let virtual time advance, so they are rejected, and *max_steps*
+        bounds the replay anyway. Returns the number of steps taken."""
+        if not hasattr(self._clock, "set"):
+            raise TypeError("run_until requires a clock that can be set, such as AthenaVirtualClock.")
+        with self._lock:
+            stuck = [job.name for job in self._jobs.values() if job.delta_time <= 0 and job.limit == 0]
+        if stuck:
+            raise ValueError(f"run_until cannot replay jobs with a zero interval and no limit: {', '.join(stuck)}")
+        steps = 0
+        while True:
+            due_time = self.next_due_time()
+            if due_time is None or due_time > end_time:
+                break
+            if steps >= max_steps:
+                raise RuntimeError(f"run_until stopped after {max_steps} steps at virtual time {self._clock.time()}")
+            self._clock.set(max(due_time, self._clock.time()))
+            self._drain_completions()
+            self._run_due_jobs(self._clock.time())
+            self._resume_cooperative()
+            steps += 1
+        self._clock.set(max(end_time, self._clock.time()))
+        self._drain_completions()
+        return steps
 
     def clear_jobs(self):
-        """Immediately forget every scheduled job."""
+        """Immediately forget every scheduled job and cancel their in‑flight coroutines."""
         with self._lock:
+            jobs = list(self._jobs.values())
             self._jobs.clear()
+            self._heap.clear()
+        for job in jobs:
+            self._cancel_runs(job)
+
+    def overrun_stats(self) -> Dict[str, Dict[str, int]]:
+        """Per‑job count of how often each overrun policy kicked in, plus a ``"total"`` entry."""
+        with self._lock:
+            stats = {name: dict(job.overruns) for name, job in self._jobs.items() if job.background}
+        stats["total"] = {policy: sum(counters[policy] for counters in stats.values()) for policy in OVERRUN_POLICIES}
+        return stats
+
+    def job_stats(self) -> Dict[str, Dict[str, Any]]:
+        """Snapshot of every job's timing statistics, the most expensive jobs (total run time) first.
+
+        ``lag`` and ``runtime`` hold rolling p50/p95/p99/max in seconds; ``missed`` counts ticks lost to a late frame
+        loop or skipped by the overrun policy, ``coalesced`` the ticks merged into another run."""
+        with self._lock:
+            jobs = list(self._jobs.values())
+        snapshot = {}
+        for job in sorted(jobs, key=lambda job: job.stats.total_runtime, reverse=True):
+            stats = job.stats.snapshot()
+            stats["missed"] += job.overruns["skip"]
+            stats["coalesced"] = job.overruns["coalesce"] + job.overruns["queue_one"]
+            stats["mode"] = job.mode
+            snapshot[job.name] = stats
+        return snapshot
+
+    def shutdown(self, wait: bool = False):
+        """Forget every job and stop the worker pools. Runs already in flight are allowed to finish."""
+        self.clear_jobs()
+        self._executor.shutdown(wait=wait, cancel_futures=True)
+        if self._process_executor is not None:
+            self._process_executor.shutdown(wait=wait, cancel_futures=True)
+        if self._loop is not None:
+            self._loop.call_soon_threadsafe(self._loop.stop)
+            if wait:
+                self._loop_thread.join()
 
 
 # ----------------------------------------------------------------------------------------------------------------------
@@ -180,23 +633,50 @@ class ImGUIAthenaApp:
         """Instantiate loggers, loaders, helpers, and register a SIGINT handler."""
         try:
             self._base = self  # Pass ourselves where older code expects a "base" reference
-            self._logs = AthenaLogs()
+            self._logs = AthenaLogs(async_mode=self._async_logs, retention=self._log_retention, ring_capacity=self._log_ring_capacity)
             self._logs.ap.info("Athena is mounting...")
 
-            # Prepare dedicated log files for the various subsystems.
-            self._logs.add_update_logger("athena_update_application", self._logs.create_file_logger("athena_update_application", "logs/athena_update_application.log", rewrite=True))
-            self._logs.add_update_logger("athena_load_resources",   self._logs.create_file_logger("athena_load_resources",   "logs/athena_load_resources.log",   rewrite=True))
-            self._logs.add_update_logger("athena_model_designer",   self._logs.create_file_logger("athena_model_designer",   "logs/athena_model_designer.log",   rewrite=True))
-            self._logs.add_update_logger("athena_agents_manager",   self._logs.create_file_logger("athena_agents_manager",   "logs/athena_agents_manager.log",   rewrite=True))
-            self._logs.add_update_logger("athena_o_clock",         self._logs.create_file_logger("athena_o_clock",         "logs/athena_o_clock.log",         rewrite=True))
+            # Prepare dedicated, size/age rotated log files for the various subsystems (structured msgpack records in
+            # binary mode). The previous session's files are rotated and compressed instead of deleted.
+            _ext = "alog" if self._binary_logs else "log"
+            _create_logger = lambda name, path, rewrite: self._logs.create_rotating_logger(name, path, rewrite=rewrite, binary=self._binary_logs)
+            self._logs.add_update_logger("athena_update_application", _create_logger("athena_update_application", f"logs/athena_update_application.{_ext}", rewrite=True))
+            self._logs.add_update_logger("athena_load_resources",   _create_logger("athena_load_resources",   f"logs/athena_load_resources.{_ext}",   rewrite=True))
+            self._logs.add_update_logger("athena_model_designer",   _create_logger("athena_model_designer",   f"logs/athena_model_designer.{_ext}",   rewrite=True))
+            self._logs.add_update_logger("athena_agents_manager",   _create_logger("athena_agents_manager",   f"logs/athena_agents_manager.{_ext}",   rewrite=True))
+            self._logs.add_update_logger("athena_o_clock",         _create_logger("athena_o_clock",         f"logs/athena_o_clock.{_ext}",         rewrite=True))
 
             # Asset loaders and utility classes ------------------------------------------------------------------------------------
-            self._loaders    = AthenaResourceLoader(base=self, resoure_directory="./assets/resources")
+            self._texture_cache = AthenaTextureCache("assets/.cache/textures")
+            self._icon_atlas = AthenaIconAtlas(self, icon_size=80)  # Desktop icons are drawn at 80x80
+            self._loaders    = AthenaResourceLoader(base=self, resoure_directory="./assets/resources", texture_cache=self._texture_cache)
             self._mlowlevel  = AthenaLowLevelMandatory(base=self)
             self._dutils     = AthenaDisplayUtils()
             self._profiles   = AthenaProfilesUtils(base=self)
             self._ranimation = RenderAnimation(self._mlowlevel)
             self._oclock     = AthenaOClock(self)
+            self._fpacer     = AthenaFramePacer(self) if self._adaptive_render else None
+            self._gcmanager  = AthenaGCManager(self) if self._managed_gc else None
+
+            self._sprofiler  = AthenaSamplingProfiler(self)
+            self._ftimer     = AthenaFrameTimer(self)
+            self._log_viewer = AthenaLogViewer(self._logs.rings)
+            self._mprofiler  = AthenaMemoryProfiler(self)
+            self._metrics_exporter = AthenaMetricsExporter(METRICS, self._metrics_path) if self._metrics_path else None
+            self._updating_application = None  # Application whose update() runs right now (read by the stall watchdog)
+            if self._stall_threshold:
+                self._logs.add_update_logger("athena_stalls", self._logs.create_rotating_logger("athena_stalls", "logs/athena_stalls.log"))
+                self._watchdog = AthenaStallWatchdog(self, threshold=self._stall_threshold)
+            else:
+                self._watchdog = None
+
+            # Memory attribution per application: trace before the applications get mounted
+            if self._memory_profiling:
+                self._mprofiler.start()
+
+            # Span tracing: internal_log_profiling sections, job runs and frames, exported on exit
+            if self._tracing:
+                TRACER.start()
 
             # Confirm successful initialisation in the logs
             self._logs.ap.info("Core subsystems initialised (Logs, Resources, Low‑Level, Display, Profiles, Animation)")
@@ -215,12 +695,56 @@ class ImGUIAthenaApp:
 
     def __handle_signal(self, signum, frame):  # Main signal handler
         """Forward *signum* to all child applications so they can shut down safely, then close DearPyGui."""
+        # No more frames from here: a slow shutdown (pool joins, application handlers) is not a stall
+        if self._watchdog is not None:
+            self._watchdog.stop()
         for application in self._meta_data["applications"].values():
             if hasattr(application, "handle_signal"):
                 application.handle_signal(signum=signum, frame=frame)
+        self._shutdown()
+
+    def _shutdown(self):
+        """Stop every subsystem, write out their reports and close DearPyGui. Runs once, whichever of the signal
+        handler and the end of the render loop gets here first."""
+        if self._shut_down:
+            return
+        self._shut_down = True
+        # No more frames from here: a slow shutdown (pool joins) is not a stall
+        if self._watchdog is not None:
+            self._watchdog.stop()
+        if self._gcmanager is not None:
+            self._gcmanager.stop()
+        self._oclock.shutdown()
+        self._ftimer.dump()
+        self._sprofiler.stop()
+        self._mprofiler.stop()
+        if self._metrics_exporter is not None:
+            self._metrics_exporter.stop()
+        self._export_trace()
+        self._logs.shutdown()  # Crash‑safe: write out everything still queued by the async log pipeline
         dpg.stop_dearpygui()
+        # dpg.cleanup_dearpygui() # Deprecated
         dpg.destroy_context()
 
+    def _toggle_sampling_profiler(self):
+        """Start/stop the sampling profiler from the Athena utils bar; stopping writes the flamegraph files."""
+        self._sprofiler.toggle()
+        dpg.configure_item("sampling_profiler", label="Stop Profiler" if self._sprofiler.running else "Start Profiler")
+
+    def _toggle_log_viewer(self):
+        if dpg.is_item_shown("athena_log_viewer"):
+            dpg.hide_item("athena_log_viewer")
+        else:
+            dpg.show_item("athena_log_viewer")
+
+    def _export_trace(self, path: str = "logs/athena_trace.json"):
+        """Write the recorded spans as a Chrome trace (open it in Perfetto or chrome://tracing)."""
+        if not TRACER.enabled:
+            return
+        TRACER.stop()
+        events = TRACER.export_chrome_trace(path)
+        self._logs.ap.info(f"[Tracing] {events} trace events written to {path}")
+
     # --------------------------------------------------------------------------------------------------
     # Asset/theme loading helpers (currently partially disabled – kept for reference)
     # --------------------------------------------------------------------------------------------------
@@ -373,7 +897,7 @@ class ImGUIAthenaApp:
                 width=130, height=130,
             )
             # The icon image ------------------------------------
-            dpg.add_image(f"{app.name}_application_icon", width=80, height=80, tag=f"{app.name}_icon_image", pos=[25, 7])
+            self._icon_atlas.add_image(app.name, width=80, height=80, tag=f"{app.name}_icon_image", pos=[25, 7])
             # The title text (two lines)
             dpg.add_text(f"{app.name}\nVersion: {app.version}", pos=[10, 90], tag=f"{app.name}_title")
             dpg.bind_item_font(f"{app.name}_title", self._meta_data["fonts"]["icon_font"])
@@ -392,34 +916,36 @@ class ImGUIAthenaApp:
         # Clear existing icons so we can recreate them in alphabetical order.
         dpg.delete_item("desktop_group", children_only=True)
 
-        for _dir in _dirs:
-            if _dir in _excludes:
-                continue
+        # One atlas upload for all the reloaded icons, reusing the slots of the old ones
+        with self._icon_atlas.batch():
+            for _dir in _dirs:
+                if _dir in _excludes:
+                    continue
 
-            _application_dir = f"{_path}/{_dir}"
-            if os.path.isdir(_application_dir) and os.path.exists(f"{_application_dir}/application.py"):
+                _application_dir = f"{_path}/{_dir}"
+                if os.path.isdir(_application_dir) and os.path.exists(f"{_application_dir}/application.py"):
 
-                # If the application was already loaded, dispose of the old instance.
-                if _dir in self._meta_data["applications"].keys():
-                    self._meta_data["applications"][_dir].delete()
+                    # If the application was already loaded, dispose of the old instance.
+                    if _dir in self._meta_data["applications"].keys():
+                        self._meta_data["applications"][_dir].delete()
 
-                module_name = f"applications.{_dir}.application"
+                    module_name = f"applications.{_dir}.application"
 
-                for m_name in list(sys.modules):
-                    if m_name.startswith(f"applications.{_dir}"):
-                        del sys.modules[m_name]
+                    for m_name in list(sys.modules):
+                        if m_name.startswith(f"applications.{_dir}"):
+                            del sys.modules[m_name]
 
-                module = importlib.import_module(module_name)
+                    module = importlib.import_module(module_name)
 
-                for name, obj in inspect.getmembers(module):
-                    if inspect.isclass(obj) and issubclass(obj, IApplication) and obj is not IApplication:
-                        # self._reload_module_recursive(module)
-                        importlib.reload(module)
+                    for name, obj in inspect.getmembers(module):
+                        if inspect.isclass(obj) and issubclass(obj, IApplication) and obj is not IApplication:
+                            # self._reload_module_recursive(module)
+                            importlib.reload(module)
 
-                        app = getattr(module, name)(self)
-                        self._mount_ui_application_desktop(app)
-                        app.mount()
-                        self._meta_data["applications"][app.name] = app
+                            app = getattr(module, name)(self)
+                            self._mount_ui_application_desktop(app)
+                            app.mount()
+                            self._meta_data["applications"][app.name] = app
 
     # Deprecated
     """
@@ -446,42 +972,44 @@ class ImGUIAthenaApp:
         _dirs = os.listdir(_path)
         _excludes = ["__pycache__"]
 
-        for _dir in _dirs:
-            if _dir in _excludes:
-                continue
-            _application_dir = f"{_path}/{_dir}"
-            if os.path.isdir(_application_dir) and os.path.exists(f"{_application_dir}/application.py"):
-
-                # application name already exists
-                if _dir in self._meta_data["applications"]:
-                    self._logs.ac.warning(f"Application {_dir} already exists")
-                    self._logs.ap.warning(f"Application {_dir} already exists")
-                    self._logs.flush_all()
+        # All the icons packed into the atlas with a single upload
+        with self._icon_atlas.batch():
+            for _dir in _dirs:
+                if _dir in _excludes:
                     continue
+                _application_dir = f"{_path}/{_dir}"
+                if os.path.isdir(_application_dir) and os.path.exists(f"{_application_dir}/application.py"):
+
+                    # application name already exists
+                    if _dir in self._meta_data["applications"]:
+                        self._logs.ac.warning(f"Application {_dir} already exists")
+                        self._logs.ap.warning(f"Application {_dir} already exists")
+                        self._logs.flush_all()
+                        continue
+
+                    module_name = f"applications.{_dir}.application"
+                    module = importlib.import_module(module_name)
+                    module_contents = dir(module)
+
+                    self._logs.ac.info(f"Mounting application {module_name}")
+                    self._logs.ap.info(f"Mounting application {module_name}")
+                    self._logs.ap.info(f"Application module contents: {module_contents}")
+                    self._logs.flush_all()
 
-                module_name = f"applications.{_dir}.application"
-                module = importlib.import_module(module_name)
-                module_contents = dir(module)
-
-                self._logs.ac.info(f"Mounting application {module_name}")
-                self._logs.ap.info(f"Mounting application {module_name}")
-                self._logs.ap.info(f"Application module contents: {module_contents}")
-                self._logs.flush_all()
-
-                for name, obj in inspect.getmembers(module):
-                    if inspect.isclass(obj) and issubclass(obj, IApplication) and obj is not IApplication:
-                        app = getattr(module, name)(self)
-                        self._mount_ui_application_desktop(app)
-                        app.mount()
-
-                # app = getattr(module, f"{_dir.capitalize()}Application")(self)
-                # self._mount_ui_application_desktop(app)
-                # app.mount()
-                self._logs.ac.info(f"Application {app.name} mounted")
-                self._logs.ap.info(f"Application {app.name} mounted")
-                self._logs.flush_all()
+                    for name, obj in inspect.getmembers(module):
+                        if inspect.isclass(obj) and issubclass(obj, IApplication) and obj is not IApplication:
+                            app = getattr(module, name)(self)
+                            self._mount_ui_application_desktop(app)
+                            app.mount()
+
+                    # app = getattr(module, f"{_dir.capitalize()}Application")(self)
+                    # self._mount_ui_application_desktop(app)
+                    # app.mount()
+                    self._logs.ac.info(f"Application {app.name} mounted")
+                    self._logs.ap.info(f"Application {app.name} mounted")
+                    self._logs.flush_all()
 
-                self._meta_data["applications"][app.name] = app
+                    self._meta_data["applications"][app.name] = app
 
     @internal_log_profiling(section="Athena Base Render")
     def _constructor_mount_ui(self):
@@ -576,6 +1104,9 @@ class ImGUIAthenaApp:
                 # dpg.add_button(label="Focus Desktop !BUG!", callback=lambda : dpg.focus_item("desktop"), tag="focus_desktop_bug", height=20)
                 dpg.add_button(label="Hot-Reload Application", tag="hot_reload_application", height=20, callback=lambda s, a, u: self._hot_reload_applications())
                 dpg.add_button(label="Save", callback=self._profiles.save_profile, tag="save", height=20)
+                dpg.add_button(label="Start Profiler", callback=lambda s, a, u: self._toggle_sampling_profiler(), tag="sampling_profiler", height=20)
+                dpg.add_button(label="Frame HUD", callback=lambda s, a, u: self._ftimer.toggle_hud(), tag="frame_hud", height=20)
+                dpg.add_button(label="Logs", callback=lambda s, a, u: self._toggle_log_viewer(), tag="log_viewer", height=20)
                 dpg.add_button(label="Quit", callback=dpg.stop_dearpygui, tag="quit", height=20)
 
             dpg.bind_item_theme("athena_utils", "global_theme")
@@ -586,6 +1117,13 @@ class ImGUIAthenaApp:
                 with dpg.group(tag="desktop_group", horizontal=True):
                     self._mount_applications()
 
+        self._ftimer.mount_hud()
+
+        # In-memory logs of this session (log_ring_capacity records per logger), opened from the Athena utils bar
+        with dpg.window(label="Logs", tag="athena_log_viewer", width=900, height=500, pos=[200, 230], show=False,
+                        no_collapse=True, on_close=lambda: dpg.hide_item("athena_log_viewer")):
+            self._log_viewer.build(parent="athena_log_viewer")
+
         dpg.setup_dearpygui()
         dpg.show_viewport()
         self._logs.ap.info("[DPG] viewport shown")
@@ -630,25 +1168,93 @@ class ImGUIAthenaApp:
         self._logs.flush_all()
 
     def _update_applications(self):
-        for app in self._meta_data["applications"].values():
-            app.update()
+        for name, app in self._meta_data["applications"].items():
+            self._updating_application = name
+            try:
+                with APP_UPDATE_DURATION.time(app=name):
+                    app.update()
+            finally:
+                self._updating_application = None
 
     def _run(self):
 
         # self._oclock.add_job("update_applications", self._update_applications, 1.0/60.0, limit=0, threaded=False)
-        self._oclock.add_job("update_applications", self._update_applications, 1.0 / 10.0, limit=0, threaded=False)
+        # 100 ms (add_job takes milliseconds): an application that needs more sets _need_update, which keeps the pacer active
+        self._oclock.add_job("update_applications", self._update_applications, 100.0, limit=0, threaded=False)
 
-        while dpg.is_dearpygui_running():
-            self._oclock.update_jobs()
-            # for app in self._meta_data["applications"].values():
-            #     app.update()
-            dpg.render_dearpygui_frame()
+        # Adaptive mode: drop to a low frame rate while idle, back to full rate on input or UI work.
+        if self._fpacer is not None:
+            self._fpacer.install_input_handlers()
+            self._oclock.set_wakeup(self._fpacer.mark_dirty)
 
-        dpg.stop_dearpygui()
-        # dpg.cleanup_dearpygui() # Deprecated
-        dpg.destroy_context()
+        if self._mprofiler.running:
+            self._oclock.add_job("memory_snapshot", self._mprofiler.snapshot, 30000, threaded=True)
 
-    def __init__(self) -> None:
+        # Stall watchdog: the loop checks in every frame, the watchdog captures the stack of frames that hang.
+        if self._watchdog is not None:
+            self._watchdog.start()
+
+        # Periodic metrics snapshot for an on-box collector.
+        if self._metrics_exporter is not None:
+            self._metrics_exporter.start()
+
+        # Managed GC: no automatic collection inside the frame, collect in its idle time instead.
+        if self._gcmanager is not None:
+            self._gcmanager.start()
+
+        while dpg.is_dearpygui_running():
+            with TRACER.span("frame", "render"):
+                if self._watchdog is not None:
+                    self._watchdog.heartbeat()
+                self._ftimer.frame_start()
+                if self._gcmanager is not None:
+                    self._gcmanager.frame_start()
+                self._oclock.update_jobs()
+                self._ftimer.update_done()
+                # for app in self._meta_data["applications"].values():
+                #     app.update()
+                # Before the render: it blocks on vsync, the frame's idle time is only left before it
+                if self._gcmanager is not None:
+                    self._gcmanager.collect_idle()
+                with TRACER.span("render_dearpygui_frame", "render"):
+                    dpg.render_dearpygui_frame()
+                self._ftimer.render_done()
+                if self._gcmanager is not None:
+                    self._gcmanager.render_done()
+            if self._fpacer is not None:
+                self._ftimer.idle_done(self._fpacer.pace())
+
+        self._shutdown()
+
+    def mark_dirty(self):
+        """Ask the render loop for full frame rate (no‑op unless the adaptive render mode is on)."""
+        if self._fpacer is not None:
+            self._fpacer.mark_dirty()
+
+    def __init__(
+            self,
+            adaptive_render: bool = True,
+            managed_gc: bool = True,
+            async_logs: bool = True,
+            binary_logs: bool = False,
+            log_retention: dict = None,
+            log_ring_capacity: int = 10_000,
+            tracing: bool = False,
+            memory_profiling: bool = False,
+            metrics_path: str = "logs/athena_metrics.prom",
+            stall_threshold: float = 1.0,
+    ) -> None:
+        self._adaptive_render = adaptive_render
+        self._managed_gc = managed_gc
+        self._async_logs = async_logs
+        self._binary_logs = binary_logs
+        self._log_retention = log_retention
+        self._log_ring_capacity = log_ring_capacity  # In-memory records kept per logger for the Logs window, 0 for none
+        self._tracing = tracing
+        self._memory_profiling = memory_profiling
+        self._metrics_path = metrics_path
+        self._stall_threshold = stall_threshold
+        self._shut_down = False
         self._meta_data = {
             "images": [],
             "fonts": {},
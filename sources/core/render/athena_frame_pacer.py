@@ -0,0 +1,102 @@
+# # Athena frame pacer – adaptive, damage-driven frame rate for the ImGUIAthenaApp render loop
+import threading
+import time
+
+import dearpygui.dearpygui as dpg
+
+
+class AthenaFramePacer:
+    """Drops the render loop to *idle_fps* when nothing happens, and back to full (vsync) rate on the next event.
+
+    The loop counts as active while there was input during the last *idle_after* seconds, while an animation thread
+    runs, while an application asked for an update, while the scheduler has UI‑side work in progress, or while some
+    code called :meth:`mark_dirty` since the last frame. While idle, the loop waits between frames but wakes up early
+    for a job due before the next idle frame or for anything posted by a background thread.
+    """
+
+    def __init__(self, base: "ImGUIAthenaApp", idle_fps: float = 5.0, idle_after: float = 1.0, log_every: float = 10.0):
+        self._base = base
+        self._idle_period = 1.0 / idle_fps
+        self._idle_after = idle_after
+        self._log_every = log_every
+
+        self._wakeup = threading.Event()  # Set by mark_dirty – interrupts an idle wait
+        self._dirty = True
+        self._last_input = time.perf_counter()
+        self._idle = False
+
+        self._frames = 0
+        self._window_start = time.perf_counter()
+        self.fps = 0.0  # Effective frame rate over the last log window
+
+    @property
+    def idle(self) -> bool:
+        """True while the loop is deliberately running at the idle frame rate."""
+        return self._idle
+
+    # ----------------------------------------------------------------------------------
+    # Damage sources
+    # ----------------------------------------------------------------------------------
+
+    def mark_dirty(self, *_):
+        """Request full rate for at least one more frame. Safe to call from any thread (and as a dpg callback)."""
+        self._dirty = True
+        self._wakeup.set()
+
+    def _on_input(self, *_):
+        self._last_input = time.perf_counter()
+        self.mark_dirty()
+
+    def install_input_handlers(self):
+        """Register global dpg handlers so that any mouse or keyboard event brings the loop back to full rate."""
+        with dpg.handler_registry(tag="athena_frame_pacer_handlers"):
+            dpg.add_mouse_move_handler(callback=self._on_input)
+            dpg.add_mouse_click_handler(callback=self._on_input)
+            dpg.add_mouse_wheel_handler(callback=self._on_input)
+            dpg.add_mouse_drag_handler(callback=self._on_input)
+            dpg.add_key_press_handler(callback=self._on_input)
+            dpg.add_key_release_handler(callback=self._on_input)
+
+    def _is_active(self, now: float) -> bool:
+        if self._dirty or now - self._last_input < self._idle_after:
+            return True
+        if self._base._ranimation.any_running() or self._base._oclock.has_pending_work():
+            return True
+        return any(app._need_update for app in self._base._meta_data["applications"].values())
+
+    # ----------------------------------------------------------------------------------
+    # Frame loop
+    # ----------------------------------------------------------------------------------
+
+    def pace(self) -> float:
+        """Call once per frame, after rendering. Returns immediately while active, waits while idle.
+        Returns the seconds actually spent waiting."""
+        now = time.perf_counter()
+        self._count_frame(now)
+
+        active = self._is_active(now)
+        self._dirty = False
+        self._wakeup.clear()
+        self._idle = False
+        if active:
+            return 0.0
+
+        # Sleep until the next idle frame, or until a job that is due before it.
+        timeout = self._idle_period
+        next_due = self._base._oclock.next_due_time()
+        if next_due is not None:
+            timeout = min(timeout, next_due - self._base._oclock.clock.time())
+        if timeout <= 0.0:
+            return 0.0  # A job is already overdue: run it on the next frame right away, no idle frame
+        self._idle = True
+        self._wakeup.wait(timeout)
+        return time.perf_counter() - now
+
+    def _count_frame(self, now: float):
+        self._frames += 1
+        elapsed = now - self._window_start
+        if elapsed >= self._log_every:
+            self.fps = self._frames / elapsed
+            self._frames = 0
+            self._window_start = now
+            self._base._logs.ap.info(f"[DPG] effective FPS {self.fps:.1f} ({'idle' if self._idle else 'active'})")
@@ -0,0 +1,151 @@
+# # Athena frame timing – rolling frame/update/render durations, percentiles and a HUD overlay
+import json
+import os
+import time
+
+import dearpygui.dearpygui as dpg
+import numpy as np
+
+SERIES = ("frame", "update", "render")
+
+
+class AthenaFrameTimer:
+    """Rolling window of the last *window* frames of the render loop.
+
+    ``frame`` is the time between two frame starts (what the user sees), ``update`` the time spent in
+    ``update_jobs`` and ``render`` in ``render_dearpygui_frame``. The pacer's deliberate idle wait (adaptive render
+    mode), reported through :meth:`idle_done`, is taken out of the frame time: it is not work the user waits for.
+    A frame is dropped when it lasted more than *drop_factor* target frame times.
+
+    The HUD is a dpg window with one line series per duration, refreshed *hud_refresh* times per second while shown.
+    """
+
+    def __init__(self, base: "ImGUIAthenaApp", window: int = 600, target_fps: float = 60.0, drop_factor: float = 1.5,
+                 hud_refresh: float = 4.0):
+        self._base = base
+        self._window = window
+        self._budget = 1.0 / target_fps
+        self._drop_factor = drop_factor
+        self._hud_period = 1.0 / hud_refresh
+
+        self._durations = {name: np.zeros(window) for name in SERIES}  # Ring buffers, in seconds
+        self._count = 0  # Frames recorded since start
+        self._dropped = 0
+        self._idle_frames = 0  # Frames that ended in an idle wait of the pacer
+        self._idle_wait = 0.0  # Idle wait of the current frame, in seconds
+        self._frame_start = None
+        self._mark = 0.0
+        self._update = self._render = 0.0
+        self._hud_refreshed = 0.0
+
+    # ----------------------------------------------------------------------------------
+    # Recording – called by ImGUIAthenaApp._run
+    # ----------------------------------------------------------------------------------
+
+    def frame_start(self):
+        """Close the previous frame and start a new one."""
+        now = time.perf_counter()
+        if self._frame_start is not None:
+            frame = now - self._frame_start - self._idle_wait
+            slot = self._count % self._window
+            self._durations["frame"][slot] = frame
+            self._durations["update"][slot] = self._update
+            self._durations["render"][slot] = self._render
+            self._count += 1
+            if frame > self._drop_factor * self._budget:
+                self._dropped += 1
+            if now - self._hud_refreshed >= self._hud_period and dpg.does_item_exist("athena_frame_hud") \
+                    and dpg.is_item_shown("athena_frame_hud"):
+                self._hud_refreshed = now
+                self._refresh_hud()
+        self._frame_start = self._mark = now
+        self._update = self._render = self._idle_wait = 0.0
+
+    def update_done(self):
+        now = time.perf_counter()
+        self._update, self._mark = now - self._mark, now
+
+    def render_done(self):
+        now = time.perf_counter()
+        self._render, self._mark = now - self._mark, now
+
+    def idle_done(self, waited: float):
+        """*waited* seconds of the current frame were spent in the pacer's idle wait (the value ``pace()`` returns)."""
+        if waited > 0.0:
+            self._idle_wait += waited
+            self._idle_frames += 1
+
+    # ----------------------------------------------------------------------------------
+    # Statistics
+    # ----------------------------------------------------------------------------------
+
+    def _window_of(self, name: str) -> np.ndarray:
+        """Durations of the window in chronological order."""
+        values = self._durations[name]
+        if self._count < self._window:
+            return values[:self._count]
+        slot = self._count % self._window
+        return np.concatenate((values[slot:], values[:slot]))
+
+    def stats(self) -> dict:
+        """p50/p95/p99/max in milliseconds per series over the window (idle waits excluded), plus frame, dropped frame
+        and idle frame counts."""
+        stats = {"frames": self._count, "dropped": self._dropped, "idle": self._idle_frames,
+                 "window": min(self._count, self._window)}
+        for name in SERIES:
+            values = self._window_of(name)
+            if not len(values):
+                stats[name] = {"p50": 0.0, "p95": 0.0, "p99": 0.0, "max": 0.0}
+                continue
+            p50, p95, p99 = np.percentile(values, (50, 95, 99)) * 1000.0
+            stats[name] = {"p50": float(p50), "p95": float(p95), "p99": float(p99), "max": float(values.max() * 1000.0)}
+        return stats
+
+    def dump(self, path: str = "logs/athena_frame_timing.json"):
+        """Write the statistics (and the raw window, in ms) for regression tracking."""
+        stats = self.stats()
+        stats["timestamp"] = time.time()
+        stats["samples"] = {name: (self._window_of(name) * 1000.0).round(3).tolist() for name in SERIES}
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        with open(path, "w", encoding="utf-8") as fd:
+            json.dump(stats, fd)
+        frame = stats["frame"]
+        self._base._logs.ap.info(
+            f"[DPG] frame time p50 {frame['p50']:.2f} ms, p95 {frame['p95']:.2f} ms, p99 {frame['p99']:.2f} ms, "
+            f"{stats['dropped']} dropped frames out of {stats['frames']} ({stats['idle']} with an idle wait), written to {path}"
+        )
+
+    # ----------------------------------------------------------------------------------
+    # HUD
+    # ----------------------------------------------------------------------------------
+
+    def mount_hud(self):
+        """Create the (hidden) HUD window. Needs the dpg context."""
+        with dpg.window(label="Frame timing", tag="athena_frame_hud", width=420, height=260, pos=[1480, 10], show=False,
+                        no_collapse=True, on_close=lambda: dpg.hide_item("athena_frame_hud")):
+            dpg.add_text("", tag="athena_frame_hud_stats")
+            with dpg.plot(height=-1, width=-1, tag="athena_frame_hud_plot"):
+                dpg.add_plot_legend()
+                dpg.add_plot_axis(dpg.mvXAxis, no_tick_labels=True, tag="athena_frame_hud_x")
+                with dpg.plot_axis(dpg.mvYAxis, label="ms", tag="athena_frame_hud_y"):
+                    for name in SERIES:
+                        dpg.add_line_series([], [], label=name, tag=f"athena_frame_hud_{name}")
+
+    def toggle_hud(self):
+        if dpg.is_item_shown("athena_frame_hud"):
+            dpg.hide_item("athena_frame_hud")
+        else:
+            dpg.show_item("athena_frame_hud")
+            self._refresh_hud()
+
+    def _refresh_hud(self):
+        stats = self.stats()
+        dpg.set_value("athena_frame_hud_stats", "\n".join(
+            f"{name:<7} p50 {stats[name]['p50']:6.2f}  p95 {stats[name]['p95']:6.2f}  p99 {stats[name]['p99']:6.2f} ms"
+            for name in SERIES
+        ) + f"\ndropped {stats['dropped']} / {stats['frames']}, {stats['idle']} with an idle wait")
+        x = list(range(stats["window"]))
+        for name in SERIES:
+            dpg.set_value(f"athena_frame_hud_{name}", [x, (self._window_of(name) * 1000.0).tolist()])
+        dpg.set_axis_limits("athena_frame_hud_x", 0, max(1, self._window - 1))
+        dpg.fit_axis_data("athena_frame_hud_y")
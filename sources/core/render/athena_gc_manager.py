@@ -0,0 +1,130 @@
+# # Athena GC manager – keep CPython collections out of the frame, run them in the frame's idle time
+import gc
+import time
+
+from sources.core.scheduler.athena_job_stats import RollingHistogram
+
+
+class AthenaGCManager:
+    """Disables automatic garbage collection while the render loop runs and collects in the idle time left in each
+    frame instead. A generation is collected once its allocation count passes CPython's own threshold and its
+    expected pause (p95 of the previous ones) fits in what is left of *frame_budget*. A generation deferred for
+    more than *max_defer* seconds is collected anyway, so memory never grows unbounded.
+
+    The budget is checked before the frame is rendered: the render call blocks on vsync, so after it nothing is left.
+    What is left is the budget minus the time since the frame started and the CPU time of the last render.
+
+    Every collection, ours or not, is timed through ``gc.callbacks`` and kept per generation.
+    """
+
+    def __init__(self, base: "ImGUIAthenaApp", frame_budget: float = 1.0 / 60.0, max_defer: float = 5.0):
+        self._base = base
+        self._frame_budget = frame_budget
+        self._max_defer = max_defer
+        self._thresholds = gc.get_threshold()
+
+        self._frame_start = time.perf_counter()
+        self._render_start = None  # Thread CPU time when the render started
+        self._render_cost = 0.0  # CPU time of the last render, kept free for it
+        self._pending_since = [None, None, None]  # When each generation first went over its threshold
+        self._in_idle = False
+        self._collect_start = 0.0
+        self._running = False
+
+        self.pauses = [RollingHistogram(window=256) for _ in range(3)]
+        self.counts = {"idle": [0, 0, 0], "in_frame": [0, 0, 0], "forced": [0, 0, 0]}
+        self.total_pause = [0.0, 0.0, 0.0]
+
+    # ----------------------------------------------------------------------------------
+    # Lifecycle
+    # ----------------------------------------------------------------------------------
+
+    def start(self):
+        gc.callbacks.append(self._on_gc)
+        gc.disable()
+        self._running = True
+        self._base._logs.ap.info(f"[GC] automatic collection disabled, thresholds {self._thresholds}")
+
+    def stop(self):
+        if not self._running:
+            return
+        self._running = False
+        gc.enable()
+        if self._on_gc in gc.callbacks:
+            gc.callbacks.remove(self._on_gc)
+        for generation, stats in self.stats().items():
+            self._base._logs.ap.info(f"[GC] generation {generation}: {stats}")
+
+    # ----------------------------------------------------------------------------------
+    # Frame loop
+    # ----------------------------------------------------------------------------------
+
+    def frame_start(self):
+        self._frame_start = time.perf_counter()
+
+    def collect_idle(self):
+        """Call once the frame is updated, right before it is rendered: collect what is due and fits in the time left
+        until the frame has to be presented."""
+        try:
+            self._collect_due()
+        finally:
+            self._render_start = time.thread_time()
+
+    def render_done(self):
+        if self._render_start is not None:
+            self._render_cost = time.thread_time() - self._render_start  # CPU only: the vsync wait is not render work
+
+    def _collect_due(self):
+        now = time.perf_counter()
+        remaining = self._frame_budget - (now - self._frame_start) - self._render_cost
+        counts = gc.get_count()
+
+        # Oldest generation first: collecting generation n also collects the younger ones.
+        for generation in (2, 1, 0):
+            if counts[generation] <= self._thresholds[generation]:
+                self._pending_since[generation] = None
+                continue
+            if self._pending_since[generation] is None:
+                self._pending_since[generation] = now
+            forced = now - self._pending_since[generation] > self._max_defer
+            if forced or self.pauses[generation].percentile(95) < remaining:
+                self._collect(generation, forced)
+                return
+
+    def _collect(self, generation: int, forced: bool):
+        self._in_idle = True
+        try:
+            gc.collect(generation)
+        finally:
+            self._in_idle = False
+        if forced:
+            self.counts["forced"][generation] += 1
+        for younger in range(generation + 1):
+            self._pending_since[younger] = None
+
+    def _on_gc(self, phase: str, info: dict):
+        if phase == "start":
+            self._collect_start = time.perf_counter()
+            return
+        pause = time.perf_counter() - self._collect_start
+        generation = info["generation"]
+        self.pauses[generation].record(pause)
+        self.total_pause[generation] += pause
+        self.counts["idle" if self._in_idle else "in_frame"][generation] += 1
+
+    # ----------------------------------------------------------------------------------
+    # Stats
+    # ----------------------------------------------------------------------------------
+
+    def stats(self) -> dict:
+        """Pause statistics per generation, in seconds. ``in_frame`` counts collections we did not schedule."""
+        return {
+            generation: {
+                "idle": self.counts["idle"][generation],
+                "in_frame": self.counts["in_frame"][generation],
+                "forced": self.counts["forced"][generation],
+                "total_pause": self.total_pause[generation],
+                **self.pauses[generation].summary(),
+            }
+            for generation in range(3)
+        }
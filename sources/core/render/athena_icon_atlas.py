@@ -0,0 +1,203 @@
+# # Athena icon atlas – application icons downscaled to their display size and packed into one texture
+import contextlib
+
+import dearpygui.dearpygui as dpg
+import numpy as np
+
+
+def _box_weights(source: int, target: int) -> np.ndarray:
+    """(target, source) resampling matrix: each output pixel averages the source pixels it covers (area filter)."""
+    edges = np.linspace(0.0, source, target + 1)
+    pixels = np.arange(source)[None, :]
+    overlap = np.clip(np.minimum(edges[1:, None], pixels + 1) - np.maximum(edges[:-1, None], pixels), 0.0, None)
+    return overlap / overlap.sum(axis=1, keepdims=True)
+
+
+def resize_rgba(image: np.ndarray, width: int, height: int) -> np.ndarray:
+    """Area resampling of a float RGBA ``(h, w, 4)`` image, in premultiplied alpha so transparent pixels do not bleed."""
+    alpha = image[..., 3:4]
+    premultiplied = np.concatenate((image[..., :3] * alpha, alpha), axis=2)
+    resized = np.einsum("ij,jkc->ikc", _box_weights(image.shape[0], height), premultiplied)
+    resized = np.einsum("lk,ikc->ilc", _box_weights(image.shape[1], width), resized)
+    alpha = resized[..., 3:4]
+    resized[..., :3] = np.divide(resized[..., :3], alpha, out=np.zeros_like(resized[..., :3]), where=alpha > 0)
+    return resized.astype(np.float32)
+
+
+class AthenaIconAtlas:
+    """One dynamic texture holding every application icon at its display size, drawn through UV sub‑rectangles.
+
+    Icons are packed on shelves (rows) of a *width* pixels wide atlas, *padding* transparent pixels apart. The atlas
+    height doubles when it is full, which recreates the texture and re‑points the images made with :meth:`add_image`;
+    otherwise adding an icon only writes its pixels and uploads the atlas again with ``set_value``. A removed icon leaves
+    a free slot reused by the next icon that fits, so hot reloads do not grow the atlas.
+
+    Inside ``with atlas.batch():`` uploads, texture creation and the images asked for are deferred to the end of the
+    block, so mounting all the applications creates the texture once, at its final size, instead of uploading once
+    per icon.
+    """
+
+    def __init__(self, base: "ImGUIAthenaApp", icon_size: int = 80, width: int = 1024, padding: int = 1,
+                 tag: str = "athena_icon_atlas"):
+        self._base = base
+        self._icon_size = icon_size
+        self._width = width
+        self._padding = padding
+        self._tag = tag
+
+        self._pixels = np.zeros((0, width, 4), dtype=np.float32)
+        self._slots = {}  # Name -> (x, y, w, h)
+        self._free = []  # Slots of removed icons
+        self._shelves = []  # [y, height, next x]
+        self._bottom = 0  # First row below the last shelf
+        self._images = {}  # Name -> dpg image item drawing it
+        self._pending = {}  # Name -> add_image arguments of the images asked for during the current batch
+        self._sources = {}  # Name -> bytes the icon would take as its own full size texture
+        self._texture = None  # Current texture tag, a new one each time the atlas is resized
+        self._texture_shape = None
+        self._generation = 0
+        self._batch = 0
+        self._dirty = False
+
+    @property
+    def texture(self) -> str:
+        if self._texture is None:
+            self._upload()
+        return self._texture
+
+    # ----------------------------------------------------------------------------------
+    # Packing
+    # ----------------------------------------------------------------------------------
+
+    def _allocate(self, width: int, height: int) -> tuple:
+        w, h = width + self._padding, height + self._padding
+        fits = [slot for slot in self._free if slot[2] >= width and slot[3] >= height]
+        if fits:
+            slot = min(fits, key=lambda slot: slot[2] * slot[3])
+            self._free.remove(slot)
+            return slot[0], slot[1], width, height
+
+        for shelf in self._shelves:
+            if h <= shelf[1] and shelf[2] + w <= self._width:
+                x, shelf[2] = shelf[2], shelf[2] + w
+                return x, shelf[0], width, height
+
+        if w > self._width:
+            raise ValueError(f"Icon of {width}px does not fit in a {self._width}px wide atlas")
+        self._shelves.append([self._bottom, h, w])
+        y, self._bottom = self._bottom, self._bottom + h
+        if self._bottom > self._pixels.shape[0]:
+            rows = max(self._pixels.shape[0], h)
+            while rows < self._bottom:
+                rows *= 2
+            self._pixels = np.concatenate((self._pixels, np.zeros((rows - self._pixels.shape[0], self._width, 4), np.float32)))
+        return 0, y, width, height
+
+    def add(self, name: str, width: int, height: int, channels: int, data):
+        """Downscale the decoded icon of *name* (``dpg.load_image`` layout) to the display size and pack it."""
+        if name in self._slots:
+            self.remove(name)
+        image = np.asarray(data, dtype=np.float32).reshape(height, width, channels)
+        if channels == 3:
+            image = np.concatenate((image, np.ones((height, width, 1), np.float32)), axis=2)
+        x, y, w, h = slot = self._allocate(self._icon_size, self._icon_size)
+        self._pixels[y:y + h, x:x + w] = resize_rgba(image, w, h)
+        self._slots[name] = slot
+        self._sources[name] = width * height * 4 * 4
+        self._changed()
+
+    def remove(self, name: str):
+        slot = self._slots.pop(name, None)
+        if slot is None:
+            return
+        x, y, w, h = slot
+        self._pixels[y:y + h, x:x + w] = 0.0
+        self._free.append(slot)
+        self._images.pop(name, None)
+        self._pending.pop(name, None)
+        self._sources.pop(name, None)
+        self._dirty = True  # Nothing shows the slot any more, uploaded with the next change
+
+    def uv(self, name: str) -> tuple:
+        """(uv_min, uv_max) of *name* in the current atlas."""
+        x, y, w, h = self._slots[name]
+        rows = self._pixels.shape[0]
+        return (x / self._width, y / rows), ((x + w) / self._width, (y + h) / rows)
+
+    # ----------------------------------------------------------------------------------
+    # dpg
+    # ----------------------------------------------------------------------------------
+
+    def add_image(self, name: str, **kwargs):
+        """``dpg.add_image`` of the icon of *name*, kept pointing at the right place when the atlas is resized.
+
+        Inside a batch the image is only created when the batch ends, once the atlas texture exists at its final size
+        (in the container that was current when it was asked for). Returns its tag either way."""
+        if "parent" not in kwargs and dpg.top_container_stack() is not None:
+            kwargs["parent"] = dpg.top_container_stack()
+        tag = kwargs.pop("tag", None) or dpg.generate_uuid()
+        self._images[name] = tag
+        if self._batch:
+            self._pending[name] = kwargs
+            self._dirty = True
+        else:
+            self._create_image(name, tag, self.texture, kwargs)
+        return tag
+
+    def _create_image(self, name: str, tag, texture: str, kwargs: dict):
+        uv_min, uv_max = self.uv(name)
+        dpg.add_image(texture, uv_min=uv_min, uv_max=uv_max, tag=tag, **kwargs)
+
+    @contextlib.contextmanager
+    def batch(self):
+        self._batch += 1
+        try:
+            yield self
+        finally:
+            self._batch -= 1
+            if not self._batch and self._dirty:
+                self._upload()
+
+    def _changed(self):
+        self._dirty = True
+        if not self._batch:
+            self._upload()
+
+    def _upload(self):
+        self._dirty = False
+        shape = self._pixels.shape
+        if shape[0] == 0:
+            self._pixels = np.zeros((self._icon_size + self._padding, self._width, 4), dtype=np.float32)
+            shape = self._pixels.shape
+        if shape == self._texture_shape:
+            dpg.set_value(self._texture, self._pixels.reshape(-1))
+        else:
+            self._recreate(shape)
+
+        pending, self._pending = self._pending, {}
+        for name, kwargs in pending.items():
+            self._create_image(name, self._images[name], self._texture, kwargs)
+
+    def _recreate(self, shape: tuple):
+        """New texture for a resized atlas, with the existing images moved over to it."""
+        previous = self._texture
+        self._generation += 1
+        self._texture, self._texture_shape = f"{self._tag}_{self._generation}", shape
+        with dpg.texture_registry(show=False):
+            dpg.add_dynamic_texture(shape[1], shape[0], self._pixels.reshape(-1), tag=self._texture)
+        for name, item in list(self._images.items()):
+            if name in self._pending:
+                continue  # Created right after, on the new texture
+            if dpg.does_item_exist(item):
+                uv_min, uv_max = self.uv(name)
+                dpg.configure_item(item, texture_tag=self._texture, uv_min=uv_min, uv_max=uv_max)
+            else:
+                del self._images[name]
+        if previous is not None:
+            dpg.delete_item(previous)
+
+        separate = sum(self._sources.values())
+        self._base._logs.ap.info(
+            f"[Atlas] {len(self._slots)} icons in a {shape[1]}x{shape[0]} texture "
+            f"({self._pixels.nbytes / 1024 / 1024:.2f} MiB, {separate / 1024 / 1024:.2f} MiB as separate textures)"
+        )
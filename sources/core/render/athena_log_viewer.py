@@ -0,0 +1,109 @@
+# # Athena log viewer – virtualized dpg view over AthenaLogRing buffers
+import math
+
+import dearpygui.dearpygui as dpg
+
+from sources.core.logs.athena_binary_logs import LEVELS
+from sources.core.logs.athena_ring_logs import format_row
+
+LEVEL_COLORS = {
+    "trace": (150, 150, 150, 255),
+    "debug": (120, 180, 255, 255),
+    "info": (230, 230, 230, 255),
+    "warn": (255, 200, 80, 255),
+    "error": (255, 90, 90, 255),
+    "critical": (255, 40, 160, 255),
+}
+
+
+class AthenaLogViewer:
+    """Log view that only draws the visible rows, like an ImGui list clipper.
+
+    The child window holds one spacer as tall as the whole filtered view (which gives it a real scrollbar) and a
+    fixed pool of text items. Each frame the view is visible, the pool is moved to the scrolled position and filled
+    with the rows under it; nothing is touched when neither the scroll position, the filter nor the buffer changed.
+    The cost per frame is bounded by the pool size whatever the buffer size.
+
+    *rings* is read live (``AthenaLogs.rings``): loggers added later show up in the logger combo, and while there is
+    no ring at all (logs created without a ring capacity) the view only says so.
+    """
+
+    def __init__(self, rings: dict, line_height: int = 17, pool_size: int = 120, follow: bool = True):
+        self._rings = rings
+        self._line_height = line_height
+        self._pool_size = pool_size
+        self._follow = follow
+        self._logger = next(iter(rings), None)
+        self._min_level = "trace"
+        self._drawn = None  # (logger, level, first row, ring total, rows count) of the last fill
+        self._count = 0
+        self._known = len(rings)  # Loggers listed in the combo
+        self._combo = self._child = self._spacer = self._status = None
+        self._pool = []
+
+    def build(self, parent):
+        with dpg.group(parent=parent):
+            with dpg.group(horizontal=True):
+                self._combo = dpg.add_combo(list(self._rings), default_value=self._logger or "", width=220,
+                                            callback=self._on_logger)
+                dpg.add_combo(list(LEVELS), default_value=self._min_level, width=100, callback=self._on_level)
+                dpg.add_checkbox(label="Follow", default_value=self._follow, callback=self._on_follow)
+                self._status = dpg.add_text("")
+            with dpg.child_window(autosize_x=True, autosize_y=True, horizontal_scrollbar=True) as self._child:
+                self._spacer = dpg.add_spacer(height=1)
+                self._pool = [dpg.add_text("", show=False) for _ in range(self._pool_size)]
+        with dpg.item_handler_registry() as handlers:
+            dpg.add_item_visible_handler(callback=self.refresh)
+        dpg.bind_item_handler_registry(self._child, handlers)
+
+    def _on_logger(self, sender, app_data):
+        self._logger = app_data
+        self._drawn = None
+
+    def _on_level(self, sender, app_data):
+        self._min_level = app_data
+        self._drawn = None
+
+    def _on_follow(self, sender, app_data):
+        self._follow = app_data
+
+    def refresh(self, *_):
+        if len(self._rings) != self._known:
+            self._known = len(self._rings)
+            dpg.configure_item(self._combo, items=list(self._rings))
+            if self._logger is None:
+                self._logger = next(iter(self._rings))
+                dpg.set_value(self._combo, self._logger)
+        if self._logger is None:
+            dpg.set_value(self._status, "No log kept in memory (log_ring_capacity is 0)")
+            return
+        ring = self._rings[self._logger]
+        line_height = self._line_height
+        count = ring.count(self._min_level)
+        if count != self._count:
+            self._count = count
+            dpg.configure_item(self._spacer, height=max(1, count * line_height))
+            dpg.set_value(self._status, f"{count} rows")
+
+        view_height = dpg.get_item_rect_size(self._child)[1] or line_height * self._pool_size
+        visible = min(self._pool_size, math.ceil(view_height / line_height) + 1)
+        if self._follow:
+            first = max(0, count - visible + 1)
+            dpg.set_y_scroll(self._child, max(0.0, count * line_height - view_height))
+        else:
+            first = min(int(dpg.get_y_scroll(self._child) // line_height), max(0, count - 1))
+
+        key = (self._logger, self._min_level, first, ring.total, visible)
+        if key == self._drawn:
+            return
+        self._drawn = key
+
+        rows = ring.rows(first, first + visible, self._min_level)
+        for i, item in enumerate(self._pool):
+            if i < len(rows):
+                timestamp, level, message = rows[i]
+                dpg.set_item_pos(item, (8, (first + i) * line_height))
+                dpg.set_value(item, format_row(timestamp, level, message))
+                dpg.configure_item(item, color=LEVEL_COLORS[level], show=True)
+            else:
+                dpg.configure_item(item, show=False)
@@ -27,6 +27,9 @@ class RenderAnimation:
     def check_animation(self, name: str) -> bool:
         assert name in self._animations_threads, f"Animation {name} not found"
         return self._animations_threads[name].is_alive()
+
+    def any_running(self) -> bool:
+        return any(thread.is_alive() for thread in self._animations_threads.values())
     
     
     # Animation
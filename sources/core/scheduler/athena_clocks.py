@@ -0,0 +1,34 @@
+# # Athena clocks – time sources for AthenaOClock
+import threading
+import time
+
+
+class AthenaWallClock:
+    """Real time, as used by the live render loop."""
+
+    def time(self) -> float:
+        return time.time()
+
+
+class AthenaVirtualClock:
+    """Simulated time that only moves when told to.
+
+    Driven by :meth:`AthenaOClock.run_until`, it jumps straight from one due job to the next, so hours of scheduled
+    activity replay in seconds with the same job order as live, and tests become deterministic.
+    """
+
+    def __init__(self, start: float = 0.0):
+        self._now = start
+        self._lock = threading.Lock()
+
+    def time(self) -> float:
+        return self._now
+
+    def set(self, now: float):
+        with self._lock:
+            if now < self._now:
+                raise ValueError(f"AthenaVirtualClock cannot go backwards ({now} < {self._now}).")
+            self._now = now
+
+    def advance(self, seconds: float):
+        self.set(self._now + seconds)
@@ -0,0 +1,154 @@
+# # Athena job pipelines – dependency-aware chains of stages scheduled by AthenaOClock
+from concurrent.futures import Future, InvalidStateError
+from typing import Any, Callable, Dict, Iterable, List
+
+import networkx as nx
+import threading
+import time
+
+
+class AthenaJobPipeline:
+    """A DAG of stages (ingest ➜ features ➜ inference ➜ decisions ➜ UI refresh...) run as one scheduled job.
+
+    Each stage runs as soon as all of its upstream stages have finished and receives their results as positional
+    arguments, in *depends_on* order. Threaded stages run on the scheduler's worker pool, so independent branches run
+    in parallel; the others run on the UI thread through the scheduler's completion queue. Every run produces a
+    timing report with its critical path, available as :attr:`last_report`.
+    """
+
+    def __init__(self, name: str):
+        self.name = name
+        self._graph = nx.DiGraph()
+        self._validated = False
+        self.last_report: Dict[str, Any] = None
+
+    def add_stage(self, name: str, func: Callable, depends_on: Iterable[str] = (), threaded: bool = True) -> "AthenaJobPipeline":
+        if name in self._graph and "func" in self._graph.nodes[name]:
+            raise ValueError(f"Stage '{name}' already exists in pipeline '{self.name}'.")
+        depends_on = tuple(depends_on)
+        self._graph.add_node(name, func=func, depends_on=depends_on, threaded=threaded)
+        self._graph.add_edges_from((upstream, name) for upstream in depends_on)
+        self._validated = False
+        return self
+
+    @property
+    def stages(self) -> List[str]:
+        """Stage names in a valid execution order."""
+        self._validate()
+        return list(nx.topological_sort(self._graph))
+
+    def _validate(self):
+        if self._validated:
+            return
+        missing = [name for name, data in self._graph.nodes(data=True) if "func" not in data]
+        if missing:
+            raise ValueError(f"Pipeline '{self.name}' depends on undeclared stages: {missing}")
+        if not nx.is_directed_acyclic_graph(self._graph):
+            cycle = " ➜ ".join(edge[0] for edge in nx.find_cycle(self._graph))
+            raise ValueError(f"Pipeline '{self.name}' has a dependency cycle: {cycle}")
+        self._validated = True
+
+    def start(self, submit: Callable, post: Callable) -> Future:
+        """Start one run. *submit(fn, *args)* hands work to a worker pool, *post(fn, *args)* to the UI thread.
+        The returned future resolves to the run report, or to the exception of the first failing stage."""
+        self._validate()
+        return _PipelineRun(self, submit, post).start()
+
+
+class _PipelineRun:
+    """State of a single pipeline run – stage completions may come from any worker thread."""
+
+    def __init__(self, pipeline: AthenaJobPipeline, submit: Callable, post: Callable):
+        self._pipeline = pipeline
+        self._graph = pipeline._graph
+        self._submit = submit
+        self._post = post
+        self._lock = threading.Lock()
+        self._remaining = {name: self._graph.in_degree(name) for name in self._graph}
+        self._results: Dict[str, Any] = {}
+        self._timings: Dict[str, tuple] = {}  # name -> (start, end), perf_counter seconds
+        self._left = len(self._remaining)
+        self._future = Future()
+        self._started = 0.0
+
+    def start(self) -> Future:
+        self._started = time.perf_counter()
+        if self._left == 0:
+            self._finish()
+        for name, count in list(self._remaining.items()):
+            if count == 0:
+                self._launch(name)
+        return self._future
+
+    def _launch(self, name: str):
+        node = self._graph.nodes[name]
+        args = tuple(self._results[upstream] for upstream in node["depends_on"])
+        if node["threaded"]:
+            self._submit(self._run_stage, name, node["func"], args)
+        else:
+            self._post(self._run_stage, name, node["func"], args)
+
+    def _run_stage(self, name: str, func: Callable, args: tuple):
+        if self._future.done():  # An upstream branch failed or the run was cancelled
+            return
+        start = time.perf_counter()
+        try:
+            result = func(*args)
+        except BaseException as e:
+            self._resolve(exception=e)
+            return
+        end = time.perf_counter()
+
+        ready = []
+        with self._lock:
+            self._results[name] = result
+            self._timings[name] = (start, end)
+            self._left -= 1
+            for downstream in self._graph.successors(name):
+                self._remaining[downstream] -= 1
+                if self._remaining[downstream] == 0:
+                    ready.append(downstream)
+            finished = self._left == 0
+        for downstream in ready:
+            self._launch(downstream)
+        if finished:
+            self._finish()
+
+    def _critical_path(self) -> List[str]:
+        """Walk back from the last stage to finish, through the upstream stage that finished last each time."""
+        if not self._timings:
+            return []
+        name = max(self._timings, key=lambda stage: self._timings[stage][1])
+        path = [name]
+        while True:
+            upstream = list(self._graph.predecessors(name))
+            if not upstream:
+                break
+            name = max(upstream, key=lambda stage: self._timings[stage][1])
+            path.append(name)
+        return path[::-1]
+
+    def _finish(self):
+        path = self._critical_path()
+        report = {
+            "pipeline": self._pipeline.name,
+            "total": time.perf_counter() - self._started,
+            "critical_path": path,
+            "critical_time": sum(self._timings[name][1] - self._timings[name][0] for name in path),
+            "stages": {
+                name: {"start": start - self._started, "duration": end - start}
+                for name, (start, end) in self._timings.items()
+            },
+        }
+        self._pipeline.last_report = report
+        self._resolve(result=report)
+
+    def _resolve(self, result=None, exception: BaseException = None):
+        # The future stays pending until resolved, so AthenaOClock can still cancel it (clear_jobs / remove_job).
+        try:
+            if exception is not None:
+                self._future.set_exception(exception)
+            else:
+                self._future.set_result(result)
+        except InvalidStateError:  # Cancelled, or another branch failed first
+            pass
@@ -0,0 +1,108 @@
+# # Athena job statistics – rolling latency / runtime histograms for AthenaOClock jobs
+import collections
+import math
+import threading
+
+
+class RollingHistogram:
+    """Log-bucketed histogram over the last *window* samples.
+
+    Recording is O(1): the bucket of the evicted sample is decremented and the new one incremented. Percentiles
+    walk the fixed bucket array, so their precision is bounded by *growth* (5% by default). The max is exact, over the
+    same window (monotonic queue of the samples that can still become the max).
+    """
+
+    def __init__(self, window: int = 512, minimum: float = 1e-6, maximum: float = 100.0, growth: float = 1.05):
+        self._minimum = minimum
+        self._log_growth = math.log(growth)
+        self._growth = growth
+        self._size = int(math.log(maximum / minimum) / self._log_growth) + 2
+        self._counts = [0] * self._size
+        self._samples = collections.deque(maxlen=window)  # Bucket index of each sample still in the window
+        self._maxima = collections.deque()  # (sequence, value), values decreasing: the window max is the first one
+        self._recorded = 0
+
+    def _bucket(self, value: float) -> int:
+        if value <= self._minimum:
+            return 0
+        return min(int(math.log(value / self._minimum) / self._log_growth) + 1, self._size - 1)
+
+    def record(self, value: float):
+        if len(self._samples) == self._samples.maxlen:
+            self._counts[self._samples[0]] -= 1
+        bucket = self._bucket(value)
+        self._samples.append(bucket)
+        self._counts[bucket] += 1
+
+        while self._maxima and self._maxima[-1][1] <= value:
+            self._maxima.pop()
+        self._maxima.append((self._recorded, value))
+        self._recorded += 1
+        if self._maxima[0][0] < self._recorded - self._samples.maxlen:
+            self._maxima.popleft()
+
+    @property
+    def max(self) -> float:
+        """Largest sample of the window, 0.0 if empty."""
+        return self._maxima[0][1] if self._maxima else 0.0
+
+    def __len__(self) -> int:
+        return len(self._samples)
+
+    def percentile(self, q: float) -> float:
+        """Upper bound of the bucket holding the *q*-th percentile (0 < q <= 100) of the window, 0.0 if empty.
+        Capped by the largest value of the window."""
+        total = len(self._samples)
+        if total == 0:
+            return 0.0
+        rank = max(1, math.ceil(total * q / 100.0))
+        seen = 0
+        for bucket, count in enumerate(self._counts):
+            seen += count
+            if seen >= rank:
+                return min(self._minimum * self._growth ** bucket, self.max)
+        return self.max
+
+    def summary(self) -> dict:
+        return {
+            "p50": self.percentile(50),
+            "p95": self.percentile(95),
+            "p99": self.percentile(99),
+            "max": self.max,
+        }
+
+
+class JobStats:
+    """Timing counters of a single job: start lag, run time and missed ticks. Times are in seconds."""
+
+    def __init__(self, window: int = 512):
+        self._lock = threading.Lock()  # Background runs report from pool threads
+        self.lag = RollingHistogram(window)
+        self.runtime = RollingHistogram(window)
+        self.runs = 0
+        self.missed = 0  # Ticks that went by while the frame loop was late
+        self.total_runtime = 0.0
+        self.last_runtime = 0.0
+
+    def record_start(self, lag: float, missed: int = 0):
+        with self._lock:
+            self.lag.record(max(lag, 0.0))
+            self.missed += missed
+
+    def record_run(self, runtime: float):
+        with self._lock:
+            self.runtime.record(runtime)
+            self.runs += 1
+            self.total_runtime += runtime
+            self.last_runtime = runtime
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return {
+                "runs": self.runs,
+                "missed": self.missed,
+                "last_runtime": self.last_runtime,
+                "total_runtime": self.total_runtime,
+                "lag": self.lag.summary(),
+                "runtime": self.runtime.summary(),
+            }
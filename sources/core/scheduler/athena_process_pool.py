@@ -0,0 +1,72 @@
+# # Athena process pool helpers – run CPU-bound AthenaOClock jobs outside of the GIL
+from multiprocessing import resource_tracker, shared_memory
+
+import numpy as np
+
+# Arrays at least this large (in bytes) are handed back through shared memory instead of being pickled.
+SHARED_MEMORY_THRESHOLD = 1 << 20
+
+
+class SharedArray:
+    """Picklable handle on a numpy array written into a shared memory block by a worker process."""
+
+    __slots__ = ("name", "shape", "dtype")
+
+    def __init__(self, name: str, shape: tuple, dtype: str):
+        self.name = name
+        self.shape = shape
+        self.dtype = dtype
+
+
+def share_array(array: np.ndarray) -> SharedArray:
+    """Copy *array* into a new shared memory block. The block is unlinked by the receiving side."""
+    shm = shared_memory.SharedMemory(create=True, size=max(array.nbytes, 1))
+    np.ndarray(array.shape, dtype=array.dtype, buffer=shm.buf)[...] = array
+    handle = SharedArray(shm.name, array.shape, array.dtype.str)
+    shm.close()
+    # Ownership moves to the receiving process: stop this worker's tracker from unlinking the block at exit.
+    resource_tracker.unregister(shm._name, "shared_memory")
+    return handle
+
+
+def unshare_array(handle: SharedArray) -> np.ndarray:
+    """Copy the array out of its shared memory block and release the block."""
+    shm = shared_memory.SharedMemory(name=handle.name)
+    try:
+        return np.ndarray(handle.shape, dtype=np.dtype(handle.dtype), buffer=shm.buf).copy()
+    finally:
+        shm.close()
+        shm.unlink()
+
+
+def _rebuild(sequence, items):
+    """Same kind of sequence as *sequence* holding *items*: namedtuples take their fields as arguments."""
+    if hasattr(sequence, "_fields"):
+        return type(sequence)(*items)
+    return type(sequence)(items)
+
+
+def _pack(result, threshold: int):
+    if isinstance(result, np.ndarray) and result.nbytes >= threshold:
+        return share_array(result)
+    if isinstance(result, (tuple, list)):
+        return _rebuild(result, [_pack(item, threshold) for item in result])
+    if isinstance(result, dict):
+        return {key: _pack(value, threshold) for key, value in result.items()}
+    return result
+
+
+def unpack_result(result):
+    """Inverse of the worker-side packing: turn every :class:`SharedArray` back into a numpy array."""
+    if isinstance(result, SharedArray):
+        return unshare_array(result)
+    if isinstance(result, (tuple, list)):
+        return _rebuild(result, [unpack_result(item) for item in result])
+    if isinstance(result, dict):
+        return {key: unpack_result(value) for key, value in result.items()}
+    return result
+
+
+def run_process_job(job: callable, args: tuple, threshold: int = SHARED_MEMORY_THRESHOLD):
+    """Entry point executed inside the worker process. *job* must be a picklable, module level callable."""
+    return _pack(job(*args), threshold)
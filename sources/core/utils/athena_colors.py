@@ -20,4 +20,12 @@ BRIGHT_WHITE = "\x1b[97m"
 BACKGROUND_BLACK = "\x1b[40m"
 BACKGROUND_RED = "\x1b[41m"
 BACKGROUND_GREEN = "\x1b[42m"
-BACKGROUND_YELLOW = "\x1b[43m"
\ No newline at end of file
+BACKGROUND_YELLOW = "\x1b[43m"
+
+import re
+
+ANSI_PATTERN = re.compile(r"\x1b\[[0-9;]*m")
+
+
+def strip_ansi(text: str) -> str:
+    return ANSI_PATTERN.sub("", text)